@@ -0,0 +1,18 @@
+-- Migration: Add partial indexes for the review queues
+-- Version: 005
+-- Description: get_flagged_transactions and get_uncategorized_transactions filter
+--              on a small subset of rows and sort by transaction_date DESC. Partial
+--              indexes over exactly those subsets let SQLite read them in order
+--              without scanning the whole transactions table.
+--
+--              Duplicate lookups (transaction_exists, statement_exists) are already
+--              served by the indexes SQLite creates for the UNIQUE constraints on
+--              transactions(account_id, transaction_date, amount, merchant_original)
+--              and statements(file_hash, account_id), so no extra indexes are added
+--              for them.
+
+CREATE INDEX IF NOT EXISTS idx_transaction_flagged_date
+    ON transactions(flagged_for_review, transaction_date DESC) WHERE flagged_for_review = 1;
+
+CREATE INDEX IF NOT EXISTS idx_transaction_uncategorized_date
+    ON transactions(transaction_date DESC) WHERE category IS NULL OR category = 'Uncategorized';
@@ -0,0 +1,101 @@
+-- Migration: Add trigger-maintained monthly summary table
+-- Version: 006
+-- Description: get_monthly_summary used to aggregate the month's transactions on
+--              every dashboard render. monthly_summary holds per-account monthly
+--              income, expenses and transaction count, kept in step with the
+--              transactions table by insert/update/delete triggers, so the
+--              summary reads a handful of rows. Totals are recomputed from
+--              existing transactions.
+
+CREATE TABLE IF NOT EXISTS monthly_summary (
+    month TEXT NOT NULL,  -- 'YYYY-MM'
+    account_id INTEGER NOT NULL,
+    total_income DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    total_expenses DECIMAL(12, 2) NOT NULL DEFAULT 0,  -- positive magnitude
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, account_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_monthly_summary_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO monthly_summary (month, account_id, total_income, total_expenses, transaction_count)
+    VALUES (
+        substr(NEW.transaction_date, 1, 7),
+        NEW.account_id,
+        CASE WHEN NEW.amount > 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.amount < 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN -NEW.amount ELSE 0 END,
+        1
+    )
+    ON CONFLICT (month, account_id) DO UPDATE SET
+        total_income = total_income + excluded.total_income,
+        total_expenses = total_expenses + excluded.total_expenses,
+        transaction_count = transaction_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_monthly_summary_delete
+AFTER DELETE ON transactions
+BEGIN
+    UPDATE monthly_summary SET
+        total_income = total_income
+            - CASE WHEN OLD.amount > 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN OLD.amount ELSE 0 END,
+        total_expenses = total_expenses
+            - CASE WHEN OLD.amount < 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN -OLD.amount ELSE 0 END,
+        transaction_count = transaction_count - 1
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id;
+    DELETE FROM monthly_summary
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id
+    AND transaction_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_monthly_summary_update
+AFTER UPDATE OF account_id, transaction_date, amount, transaction_type ON transactions
+BEGIN
+    UPDATE monthly_summary SET
+        total_income = total_income
+            - CASE WHEN OLD.amount > 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN OLD.amount ELSE 0 END,
+        total_expenses = total_expenses
+            - CASE WHEN OLD.amount < 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN -OLD.amount ELSE 0 END,
+        transaction_count = transaction_count - 1
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id;
+    DELETE FROM monthly_summary
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id
+    AND transaction_count = 0;
+    INSERT INTO monthly_summary (month, account_id, total_income, total_expenses, transaction_count)
+    VALUES (
+        substr(NEW.transaction_date, 1, 7),
+        NEW.account_id,
+        CASE WHEN NEW.amount > 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.amount < 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN -NEW.amount ELSE 0 END,
+        1
+    )
+    ON CONFLICT (month, account_id) DO UPDATE SET
+        total_income = total_income + excluded.total_income,
+        total_expenses = total_expenses + excluded.total_expenses,
+        transaction_count = transaction_count + 1;
+END;
+
+-- Backfill from existing transactions. init_schema may have created the table
+-- (without backfilling it) before this migration ran, leaving months that got
+-- inserts since then with partial totals, so recompute every row.
+DELETE FROM monthly_summary;
+
+INSERT INTO monthly_summary (month, account_id, total_income, total_expenses, transaction_count)
+SELECT
+    substr(transaction_date, 1, 7),
+    account_id,
+    SUM(CASE WHEN amount > 0 AND transaction_type NOT IN ('payment', 'transfer')
+             THEN amount ELSE 0 END),
+    SUM(CASE WHEN amount < 0 AND transaction_type NOT IN ('payment', 'transfer')
+             THEN -amount ELSE 0 END),
+    COUNT(*)
+FROM transactions
+GROUP BY substr(transaction_date, 1, 7), account_id;
@@ -0,0 +1,51 @@
+-- Migration: Add batch and per-file ingestion tracking tables
+-- Version: 007
+-- Description: Database methods for resumable ingestion (create_batch,
+--              create_file_status, detect_resume_state, ...) use
+--              ingestion_batches and ingestion_file_status, which were never part
+--              of the schema. Creates both tables, if missing, with the indexes
+--              used by the resume and progress queries.
+
+CREATE TABLE IF NOT EXISTS ingestion_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingestion_log_id INTEGER NOT NULL,
+    batch_number INTEGER NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    completed_at TIMESTAMP,
+    status TEXT DEFAULT 'pending',
+    total_files INTEGER DEFAULT 0,
+    files_processed INTEGER DEFAULT 0,
+    files_failed INTEGER DEFAULT 0,
+    summary TEXT,
+    FOREIGN KEY (ingestion_log_id) REFERENCES ingestion_log(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_batches_log_status
+    ON ingestion_batches(ingestion_log_id, status, batch_number);
+
+CREATE TABLE IF NOT EXISTS ingestion_file_status (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingestion_log_id INTEGER NOT NULL,
+    batch_id INTEGER,
+    file_name TEXT NOT NULL,
+    file_hash TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_message TEXT,
+    statement_id INTEGER,
+    transactions_inserted INTEGER,
+    FOREIGN KEY (ingestion_log_id) REFERENCES ingestion_log(id),
+    FOREIGN KEY (batch_id) REFERENCES ingestion_batches(id),
+    FOREIGN KEY (statement_id) REFERENCES statements(id)
+);
+
+-- Resume/progress lookups: all files of a run by status, the files still to
+-- process (pending/failed), and the hashes of completed files
+CREATE INDEX IF NOT EXISTS idx_ifs_log_status
+    ON ingestion_file_status(ingestion_log_id, status, id);
+CREATE INDEX IF NOT EXISTS idx_ifs_pending
+    ON ingestion_file_status(ingestion_log_id, id) WHERE status IN ('pending', 'failed');
+CREATE INDEX IF NOT EXISTS idx_ifs_completed
+    ON ingestion_file_status(ingestion_log_id, file_hash) WHERE status = 'completed';
@@ -43,19 +43,33 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.config import get_config
-from src.database.models import Account, Database, Statement, Transaction
+from src.database.models import Account, Database, Statement, round_amount
 
 
-def setup_logging(log_file: Path):
-    """Set up logging to file."""
-    log_file.parent.mkdir(parents=True, exist_ok=True)
+# Set by the first setup_logging call in this process
+_logging_configured = False
+
+
+def setup_logging(log_file: Path | None = None):
+    """Set up logging to stderr and, if given, to a log file.
+
+    Only the first call in a process has any effect, so running main()
+    repeatedly in one process (as the tests do) does not stack handlers or
+    open more log files.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+
+    handlers = [logging.StreamHandler(sys.stderr)]
+    if log_file is not None:
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        handlers.insert(0, logging.FileHandler(log_file))
     logging.basicConfig(
         level=logging.DEBUG,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stderr),
-        ],
+        handlers=handlers,
     )
 
 
@@ -133,17 +147,27 @@ def insert_statement_data(db: Database, data: dict, file_hash: str) -> dict:
         statement_id = db.create_statement(statement_obj)
         logger.info(f"Statement created with ID: {statement_id}")
 
-        # Insert transactions
+        # Insert transactions, skipping ones already stored for this account
         transactions_to_insert = []
         duplicates = 0
 
-        for txn_data in transactions_data:
+        parsed_dates = [
+            parse_date(txn_data["transaction_date"]) for txn_data in transactions_data
+        ]
+        # Rows without a date can't be stored; create_transactions_raw drops them
+        known_dates = [d for d in parsed_dates if d is not None]
+        existing_keys = (
+            db.get_transaction_keys(account_id, min(known_dates), max(known_dates))
+            if known_dates
+            else set()
+        )
+
+        for txn_data, transaction_date in zip(transactions_data, parsed_dates):
+            amount = round_amount(float(txn_data["amount"]))
             # Check if transaction already exists
-            if db.transaction_exists(
-                account_id=account_id,
-                transaction_date=parse_date(txn_data["transaction_date"]),
-                amount=float(txn_data["amount"]),
-                merchant=txn_data["merchant_original"],
+            if transaction_date is not None and (
+                (transaction_date.isoformat(), amount, txn_data["merchant_original"])
+                in existing_keys
             ):
                 duplicates += 1
                 logger.debug(
@@ -152,29 +176,27 @@ def insert_statement_data(db: Database, data: dict, file_hash: str) -> dict:
                 )
                 continue
 
-            # Create transaction object
-            txn_obj = Transaction(
-                id=None,
-                statement_id=statement_id,
-                account_id=account_id,
-                transaction_date=parse_date(txn_data["transaction_date"]),
-                post_date=parse_date(txn_data.get("post_date")),
-                amount=float(txn_data["amount"]),
-                transaction_type=txn_data["transaction_type"],
-                merchant_original=txn_data["merchant_original"],
-                merchant_cleaned=txn_data.get("merchant_cleaned"),
-                description=txn_data.get("description"),
-                category=None,  # Will be categorized later
-                confidence_score=None,
-                flagged_for_review=False,
-                notes=None,
-                created_at=None,
-                updated_at=None,
+            # Build row in TRANSACTION_INSERT_COLUMNS order (ingest fast path)
+            transactions_to_insert.append(
+                (
+                    statement_id,
+                    account_id,
+                    transaction_date,
+                    parse_date(txn_data.get("post_date")),
+                    amount,
+                    txn_data["transaction_type"],
+                    txn_data["merchant_original"],
+                    txn_data.get("merchant_cleaned"),
+                    txn_data.get("description"),
+                    None,  # category: will be categorized later
+                    None,  # confidence_score
+                    False,  # flagged_for_review
+                    None,  # notes
+                )
             )
-            transactions_to_insert.append(txn_obj)
 
         # Batch insert transactions
-        inserted = db.create_transactions_batch(transactions_to_insert)
+        inserted = db.create_transactions_raw(transactions_to_insert)
         logger.info(
             f"Inserted {inserted} transactions, {duplicates} duplicates skipped"
         )
@@ -194,7 +216,8 @@ def insert_statement_data(db: Database, data: dict, file_hash: str) -> dict:
         return {"success": False, "error": str(e)}
 
 
-def main():
+def main(argv: list[str] | None = None) -> int:
+    """Main entry point; argv defaults to sys.argv[1:]."""
     parser = argparse.ArgumentParser(description="Insert statement data into database")
     parser.add_argument(
         "json_file",
@@ -209,7 +232,7 @@ def main():
     parser.add_argument(
         "--file-hash", type=str, required=True, help="SHA256 hash of PDF file"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Get database path from environment or config
     import os
@@ -217,10 +240,8 @@ def main():
     db_path = os.environ.get("DATABASE_PATH")
     if db_path:
         # Use environment variable (for testing)
+        setup_logging()
         logger = logging.getLogger(__name__)
-        logging.basicConfig(
-            level=logging.DEBUG, handlers=[logging.StreamHandler(sys.stderr)]
-        )
         logger.info("=" * 60)
         logger.info("Statement Insertion Started (using DATABASE_PATH from env)")
     else:
@@ -265,6 +286,7 @@ def main():
     # Insert into database
     db = Database(db_path)
     result = insert_statement_data(db, data, args.file_hash)
+    db.close()
 
     # Update ingestion log if provided
     if args.log_id and result["success"] and not result.get("duplicate_statement"):
@@ -3,8 +3,6 @@
 import os
 from pathlib import Path
 
-import yaml
-
 
 class ConfigError(Exception):
     """Configuration error."""
@@ -35,6 +33,10 @@ def load_config(config_path: Path = None) -> dict:
             f"Please copy config.example.yaml to config.yaml and customize it."
         )
 
+    # Imported here: scripts given DATABASE_PATH never read the config file,
+    # and yaml is the slowest import on their startup path
+    import yaml
+
     with open(config_path) as f:
         config = yaml.safe_load(f)
 
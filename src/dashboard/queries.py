@@ -1,12 +1,17 @@
 """Read-only database queries for the dashboard."""
 
+import os
 import sqlite3
+import threading
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import date, datetime, timedelta
 from typing import Optional
 
-from src.database.models import IngestionLog
+from src.database.models import INGESTION_LOG_COLUMNS, IngestionLog
+
+# Bytes of the database file each read connection may memory-map (256 MiB)
+MMAP_SIZE = 256 * 1024 * 1024
 
 
 @dataclass
@@ -58,16 +63,128 @@ class DashboardQueries:
             db_path: Path to SQLite database.
         """
         self.db_path = db_path
+        # One read-only connection shared by all request threads (the dev
+        # server runs each request on a new thread), opened on first use and
+        # used only while holding _lock
+        self._lock = threading.RLock()
+        self._conn = None
+        self._conn_file_id = None
+        # Results memoized by _cached, valid while data_version is unchanged
+        self._cache = {}
+        self._data_version = None
+
+    def _file_id(self) -> Optional[tuple[int, int]]:
+        """Identify the database file, so a replaced file can be detected."""
+        try:
+            stat = os.stat(self.db_path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read-only connection with the dashboard's settings."""
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        return conn
 
     @contextmanager
     def get_connection(self):
-        """Get read-only database connection."""
-        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+        """Get the shared read-only database connection.
+
+        Callers on other threads wait until the block exits. The connection
+        is reopened if the database file is replaced (e.g. by a sync client),
+        since an open connection keeps reading the old file.
+        """
+        with self._lock:
+            file_id = self._file_id()
+            if self._conn is not None and self._conn_file_id != file_id:
+                self.close()
+            if self._conn is None:
+                self._conn = self._connect()
+                self._conn_file_id = file_id
+            yield self._conn
+
+    def close(self):
+        """Close the shared connection, if open, and drop memoized results."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache.clear()
+            self._data_version = None
+
+    def _cached(self, query, *args):
+        """Return query(*args), reusing the result until the database changes.
+
+        Results are dropped whenever PRAGMA data_version on the shared
+        connection shows a commit from another connection (e.g. an ingestion
+        run), so repeated renders of a month skip the aggregation.
+        """
+        with self.get_connection() as conn:
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._data_version != data_version:
+                self._cache.clear()
+                self._data_version = data_version
+            key = (query.__name__, *args)
+            if key not in self._cache:
+                self._cache[key] = query(*args)
+            return self._cache[key]
+
+    def _has_monthly_summary(self, conn: sqlite3.Connection) -> bool:
+        """Check for the monthly_summary table (added by migration 006).
+
+        The dashboard opens the database read-only, so it cannot create the
+        table on databases that have not been migrated yet.
+        """
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'monthly_summary'"
+        ).fetchone()
+        return row is not None
+
+    def _month_totals(self, year: int, month: int) -> tuple[float, float, int]:
+        """Get (income, expenses, transaction count) for a month."""
+        month_str = f"{year}-{month:02d}"
+        with self.get_connection() as conn:
+            if self._has_monthly_summary(conn):
+                # Totals are kept per account by the monthly_summary triggers
+                row = conn.execute(
+                    """
+                    SELECT
+                        COALESCE(SUM(total_income), 0) as income,
+                        COALESCE(SUM(total_expenses), 0) as expenses,
+                        COALESCE(SUM(transaction_count), 0) as count
+                    FROM monthly_summary
+                    WHERE month = ?
+                    """,
+                    (month_str,),
+                ).fetchone()
+            else:
+                if month == 12:
+                    end_date = f"{year + 1}-01-01"
+                else:
+                    end_date = f"{year}-{month + 1:02d}-01"
+                row = conn.execute(
+                    """
+                    SELECT
+                        COALESCE(SUM(CASE WHEN amount > 0
+                            AND transaction_type NOT IN ('payment', 'transfer')
+                            THEN amount END), 0) as income,
+                        COALESCE(SUM(CASE WHEN amount < 0
+                            AND transaction_type NOT IN ('payment', 'transfer')
+                            THEN -amount END), 0) as expenses,
+                        COUNT(*) as count
+                    FROM transactions
+                    WHERE transaction_date >= ? AND transaction_date < ?
+                    """,
+                    (f"{month_str}-01", end_date),
+                ).fetchone()
+        # Running sums can pick up float noise as rows are added/removed
+        return round(row["income"], 2), round(row["expenses"], 2), row["count"]
 
     def get_monthly_summary(self, year: int, month: int) -> MonthlySummary:
         """Get summary for a specific month.
@@ -80,51 +197,9 @@ class DashboardQueries:
             MonthlySummary with totals and stats.
         """
         month_str = f"{year}-{month:02d}"
-        start_date = f"{month_str}-01"
-
-        # Calculate end of month
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-
-        with self.get_connection() as conn:
-            # Get income (positive amounts)
-            income_row = conn.execute(
-                """
-                SELECT COALESCE(SUM(amount), 0) as total
-                FROM transactions
-                WHERE transaction_date >= ? AND transaction_date < ?
-                AND amount > 0
-                AND transaction_type NOT IN ('payment', 'transfer')
-                """,
-                (start_date, end_date),
-            ).fetchone()
-            total_income = abs(income_row["total"])
-
-            # Get expenses (negative amounts)
-            expense_row = conn.execute(
-                """
-                SELECT COALESCE(SUM(amount), 0) as total
-                FROM transactions
-                WHERE transaction_date >= ? AND transaction_date < ?
-                AND amount < 0
-                AND transaction_type NOT IN ('payment', 'transfer')
-                """,
-                (start_date, end_date),
-            ).fetchone()
-            total_expenses = abs(expense_row["total"])
-
-            # Get transaction count
-            count_row = conn.execute(
-                """
-                SELECT COUNT(*) as count
-                FROM transactions
-                WHERE transaction_date >= ? AND transaction_date < ?
-                """,
-                (start_date, end_date),
-            ).fetchone()
-            transaction_count = count_row["count"]
+        total_income, total_expenses, transaction_count = self._cached(
+            self._month_totals, year, month
+        )
 
         # Calculate days
         month_start = date(year, month, 1)
@@ -166,6 +241,14 @@ class DashboardQueries:
         Returns:
             List of CategoryBreakdown sorted by amount.
         """
+        # Copies, so callers can't alter the memoized results
+        return [
+            replace(category)
+            for category in self._cached(self._category_breakdown, year, month)
+        ]
+
+    def _category_breakdown(self, year: int, month: int) -> list[CategoryBreakdown]:
+        """Run the get_category_breakdown query (uncached)."""
         month_str = f"{year}-{month:02d}"
         start_date = f"{month_str}-01"
 
@@ -291,18 +374,27 @@ class DashboardQueries:
                 params + [limit, offset],
             ).fetchall()
 
+            # Unpacked positionally, in SELECT order, rather than by column name
             transactions = [
                 TransactionView(
-                    id=row["id"],
-                    date=row["transaction_date"],
-                    merchant=row["merchant"],
-                    category=row["category"],
-                    amount=row["amount"],
-                    account_name=row["account_name"] or "Unknown",
-                    transaction_type=row["transaction_type"],
-                    is_income=row["amount"] > 0,
+                    id=txn_id,
+                    date=txn_date,
+                    merchant=merchant,
+                    category=txn_category,
+                    amount=amount,
+                    account_name=account_name or "Unknown",
+                    transaction_type=txn_type,
+                    is_income=amount > 0,
                 )
-                for row in rows
+                for (
+                    txn_id,
+                    txn_date,
+                    merchant,
+                    txn_category,
+                    amount,
+                    account_name,
+                    txn_type,
+                ) in rows
             ]
 
             return transactions, total_count
@@ -330,16 +422,26 @@ class DashboardQueries:
             List of (year, month) tuples, most recent first.
         """
         with self.get_connection() as conn:
+            if not self._has_monthly_summary(conn):
+                rows = conn.execute(
+                    """
+                    SELECT DISTINCT
+                        CAST(strftime('%Y', transaction_date) AS INTEGER) as year,
+                        CAST(strftime('%m', transaction_date) AS INTEGER) as month
+                    FROM transactions
+                    ORDER BY year DESC, month DESC
+                    """
+                ).fetchall()
+                return [(row["year"], row["month"]) for row in rows]
+
             rows = conn.execute(
                 """
-                SELECT DISTINCT
-                    CAST(strftime('%Y', transaction_date) AS INTEGER) as year,
-                    CAST(strftime('%m', transaction_date) AS INTEGER) as month
-                FROM transactions
-                ORDER BY year DESC, month DESC
+                SELECT DISTINCT month FROM monthly_summary ORDER BY month DESC
                 """
             ).fetchall()
-            return [(row["year"], row["month"]) for row in rows]
+            return [
+                (int(row["month"][:4]), int(row["month"][5:7])) for row in rows
+            ]
 
     def get_available_months_with_expenses(self) -> list[tuple[int, int]]:
         """Get list of months that have expense transactions.
@@ -485,24 +587,13 @@ class DashboardQueries:
         """Get the most recent completed ingestion log."""
         with self.get_connection() as conn:
             row = conn.execute(
-                """
-                SELECT * FROM ingestion_log
+                f"""
+                SELECT {INGESTION_LOG_COLUMNS} FROM ingestion_log
                 WHERE status = 'completed'
                 ORDER BY completed_at DESC
                 LIMIT 1
                 """
             ).fetchone()
             if row:
-                return IngestionLog(
-                    id=row["id"],
-                    started_at=row["started_at"],
-                    completed_at=row["completed_at"],
-                    status=row["status"],
-                    pdfs_processed=row["pdfs_processed"],
-                    transactions_added=row["transactions_added"],
-                    transactions_updated=row["transactions_updated"],
-                    errors=row["errors"],
-                    summary=row["summary"],
-                    created_at=row["created_at"],
-                )
+                return IngestionLog(*row)
             return None
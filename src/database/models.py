@@ -1,14 +1,18 @@
 """Database access layer for Lavender Ledger."""
 
+import os
+import re
 import sqlite3
+import threading
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, replace
 from datetime import date, datetime
+from itertools import combinations
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     id: Optional[int]
     account_name: str
@@ -19,7 +23,7 @@ class Account:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Statement:
     id: Optional[int]
     account_id: int
@@ -32,7 +36,7 @@ class Statement:
     processed_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     id: Optional[int]
     account_id: int
@@ -52,7 +56,7 @@ class Transaction:
     updated_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CategorizationRule:
     id: Optional[int]
     merchant_pattern: str
@@ -74,7 +78,7 @@ class CategorizationRule:
     accuracy_score: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     id: Optional[int]
     name: str
@@ -85,7 +89,7 @@ class Category:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IngestionLog:
     id: Optional[int]
     started_at: datetime
@@ -99,7 +103,7 @@ class IngestionLog:
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IngestionBatch:
     """Represents a batch of PDFs processed together."""
 
@@ -115,7 +119,7 @@ class IngestionBatch:
     summary: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class IngestionFileStatus:
     """Tracks individual file processing status for resume capability."""
 
@@ -133,34 +137,347 @@ class IngestionFileStatus:
     transactions_inserted: Optional[int] = None
 
 
+# Explicit column lists in dataclass field order, so rows can be unpacked
+# positionally into the matching dataclass instead of keyword-by-keyword.
+ACCOUNT_COLUMNS = (
+    "id, account_name, account_type, bank_name, last_four, is_active, created_at"
+)
+TRANSACTION_COLUMNS = (
+    "id, account_id, transaction_date, amount, merchant_original, transaction_type, "
+    "statement_id, post_date, merchant_cleaned, description, category, "
+    "confidence_score, flagged_for_review, notes, created_at, updated_at"
+)
+CATEGORY_COLUMNS = "id, name, parent_category, color, icon, is_active, created_at"
+INGESTION_LOG_COLUMNS = (
+    "id, started_at, status, completed_at, pdfs_processed, transactions_added, "
+    "transactions_updated, errors, summary, created_at"
+)
+# Column order for transaction inserts (and create_transactions_raw rows)
+TRANSACTION_INSERT_COLUMNS = (
+    "statement_id, account_id, transaction_date, post_date, amount, "
+    "transaction_type, merchant_original, merchant_cleaned, description, "
+    "category, confidence_score, flagged_for_review, notes"
+)
+FILE_STATUS_COLUMNS = (
+    "id, ingestion_log_id, file_name, file_hash, file_path, status, batch_id, "
+    "started_at, completed_at, error_message, statement_id, transactions_inserted"
+)
+# Columns yielded by iter_pending_file_rows
+PENDING_FILE_COLUMNS = "id, file_name, file_hash, file_path"
+# Optional columns accepted by update_batch_status / update_file_status,
+# in SET clause order
+BATCH_UPDATE_COLUMNS = ("completed_at", "files_processed", "files_failed", "summary")
+FILE_STATUS_UPDATE_COLUMNS = (
+    "started_at",
+    "completed_at",
+    "error_message",
+    "statement_id",
+    "transactions_inserted",
+)
+
+# Recomputes monthly_summary from transactions (see migration 006). Replaces
+# any existing rows, so partial totals from an unbackfilled table are fixed
+MONTHLY_SUMMARY_REBUILD = (
+    "DELETE FROM monthly_summary",
+    """INSERT INTO monthly_summary (
+        month, account_id, total_income, total_expenses, transaction_count
+    )
+    SELECT
+        substr(transaction_date, 1, 7),
+        account_id,
+        SUM(CASE WHEN amount > 0 AND transaction_type NOT IN ('payment', 'transfer')
+                 THEN amount ELSE 0 END),
+        SUM(CASE WHEN amount < 0 AND transaction_type NOT IN ('payment', 'transfer')
+                 THEN -amount ELSE 0 END),
+        COUNT(*)
+    FROM transactions
+    GROUP BY substr(transaction_date, 1, 7), account_id""",
+)
+
+# Default categories seeded on init: (name, parent_category, color, icon)
+DEFAULT_CATEGORIES = (
+    # Income
+    ("Salary", "Income", "#81C784", None),
+    ("Freelance", "Income", "#A5D6A7", None),
+    ("Investment Income", "Income", "#C8E6C9", None),
+    ("Other Income", "Income", "#E8F5E9", None),
+    # Expenses
+    ("Groceries", "Expenses", "#9B7EBD", None),
+    ("Dining & Restaurants", "Expenses", "#C8B6E2", None),
+    ("Transportation", "Expenses", "#7B68A6", None),
+    ("Housing", "Expenses", "#D5C6E8", None),
+    ("Healthcare", "Expenses", "#B39CD8", None),
+    ("Entertainment", "Expenses", "#E6D5F5", None),
+    ("Shopping", "Expenses", "#A890C8", None),
+    ("Subscriptions", "Expenses", "#BFA9D4", None),
+    ("Travel", "Expenses", "#9D85BA", None),
+    ("Personal Care", "Expenses", "#D0BFEA", None),
+    ("Education", "Expenses", "#C4B0DC", None),
+    ("Insurance", "Expenses", "#B8A4D0", None),
+    ("Gifts & Donations", "Expenses", "#D8CAE8", None),
+    ("Pets", "Expenses", "#CFC0E0", None),
+    ("Childcare & Kids", "Expenses", "#E0D4F0", None),
+    ("Home Improvement", "Expenses", "#A698C0", None),
+    ("Professional Services", "Expenses", "#9A8CB4", None),
+    ("Fees & Interest", "Expenses", "#8E80A8", None),
+    ("Taxes", "Expenses", "#82749C", None),
+    # Special
+    ("Uncategorized", "Special", "#BDBDBD", None),
+    ("Transfer", "Special", "#90A4AE", None),
+    ("Credit Card Payment", "Special", "#78909C", None),
+)
+
+# Values allowed by the transactions.transaction_type CHECK constraint, which
+# (like any SQLite CHECK) also lets NULL through
+TRANSACTION_TYPES = frozenset(
+    {"expense", "income", "payment", "fee", "interest", "transfer"}
+)
+
+# Rows pulled per fetchmany() call by the iter_* methods
+FETCH_CHUNK_SIZE = 1000
+
+# Milliseconds a connection waits on a locked database before SQLITE_BUSY
+BUSY_TIMEOUT_MS = 5000
+
+# Per-connection settings for writable connections (page cache is 64 MiB).
+# synchronous stays at the default FULL: with a rollback journal, NORMAL can
+# corrupt the file on power loss
+WRITER_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+
+# Environment variable the test suite sets to skip fsyncs on its throwaway
+# databases. Never set it for a real ledger.
+TEST_FAST_ENV = "LL_TEST_FAST"
+TEST_FAST_PRAGMAS = ("PRAGMA synchronous = OFF",)
+
+
+def _pattern_to_regex(pattern: str) -> str:
+    """Translate a rule's merchant pattern to regex source with LIKE semantics.
+
+    ``*`` and ``%`` match any run of characters and ``_`` matches a single
+    character; everything else is literal. Matching is done on upper-cased
+    text, as with the original ``LIKE`` comparison.
+    """
+    parts = []
+    for char in pattern.upper():
+        if char in "*%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts) + r"\Z"
+
+
+def _update_sql_variants(table: str, columns: tuple[str, ...]) -> dict:
+    """Build ``UPDATE table SET status = ?, ... WHERE id = ?`` for every subset.
+
+    Keyed by the frozenset of optional columns set. Placeholders follow the
+    declared order of ``columns``, after ``status`` and before ``id``.
+
+    The status-only variant skips rows already in that status (reusing the
+    first parameter as ``?1``), so repeated status refreshes write nothing.
+    """
+    variants = {}
+    for r in range(len(columns) + 1):
+        for subset in combinations(columns, r):
+            updates = ", ".join(["status = ?", *(f"{c} = ?" for c in subset)])
+            variants[frozenset(subset)] = f"UPDATE {table} SET {updates} WHERE id = ?"
+    variants[frozenset()] += " AND status IS NOT ?1"
+    return variants
+
+
+def round_amount(amount: Optional[float]) -> Optional[float]:
+    """Round a dollar amount to whole cents before it is stored or compared.
+
+    Amounts are matched exactly by the transactions UNIQUE constraint, so the
+    same amount must always produce the same float (e.g. 0.1 + 0.2 -> 0.3).
+    """
+    return None if amount is None else round(amount, 2)
+
+
+def partition_transaction_rows(
+    rows: list[tuple],
+) -> tuple[list[tuple], list[tuple]]:
+    """Split transaction insert rows into (valid, invalid) in one pass.
+
+    Applies the transactions table's CHECK and NOT NULL rules in Python, so
+    rows that would be rejected never reach SQLite. Rows are tuples in
+    TRANSACTION_INSERT_COLUMNS order.
+    """
+    valid, invalid = [], []
+    for row in rows:
+        if (
+            (row[5] is None or row[5] in TRANSACTION_TYPES)
+            and row[1] is not None
+            and row[2] is not None
+            and row[4] is not None
+            and row[6] is not None
+        ):
+            valid.append(row)
+        else:
+            invalid.append(row)
+    return valid, invalid
+
+
+_BATCH_UPDATE_SQL = _update_sql_variants("ingestion_batches", BATCH_UPDATE_COLUMNS)
+_FILE_STATUS_UPDATE_SQL = _update_sql_variants(
+    "ingestion_file_status", FILE_STATUS_UPDATE_COLUMNS
+)
+
+
 class Database:
     """Database access layer with read-only mode support."""
 
     def __init__(self, db_path: str, read_only: bool = False):
         self.db_path = db_path
         self.read_only = read_only
-
-    @contextmanager
-    def get_connection(self):
-        """Get database connection with proper handling."""
+        self._rule_matcher = None
+        self._rule_select = None
+        # Accounts found by get_account_by_name, keyed by account name
+        self._account_cache: dict[str, Account] = {}
+        # One long-lived connection per thread, opened on first use
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection with this database's per-connection settings."""
         if self.read_only:
             conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
         else:
             conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        # Autocommit mode: transactions are opened explicitly by write_transaction
+        # rather than by the driver's implicit BEGIN before each DML statement
+        conn.isolation_level = None
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        if not self.read_only:
+            for pragma in WRITER_PRAGMAS:
+                conn.execute(pragma)
+            if os.environ.get(TEST_FAST_ENV):
+                for pragma in TEST_FAST_PRAGMAS:
+                    conn.execute(pragma)
+        return conn
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @contextmanager
+    def get_connection(self, row_factory=sqlite3.Row):
+        """Get this thread's database connection.
+
+        The connection is opened on first use and reused by later calls on
+        the same thread until close(); leaving the block does not close it.
+
+        Args:
+            row_factory: Row factory for the connection. Defaults to sqlite3.Row
+                         for name-based access; pass None for plain tuples.
+        """
+        conn = self._thread_connection()
+        # Restored on exit so nested blocks keep their own row type
+        previous_factory = conn.row_factory
+        conn.row_factory = row_factory
         try:
             yield conn
         finally:
+            conn.row_factory = previous_factory
+
+    def close(self):
+        """Close the calling thread's connection, if one is open.
+
+        Call once done with the database (e.g. at process shutdown); a later
+        call to get_connection opens a fresh connection.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
             conn.close()
 
+    @contextmanager
+    def bulk_connection(self):
+        """Get a connection returning plain tuples, for positional bulk reads."""
+        with self.get_connection(row_factory=None) as conn:
+            yield conn
+
+    @contextmanager
+    def write_transaction(self):
+        """Get a connection with an open BEGIN IMMEDIATE transaction.
+
+        Commits when the block exits normally and rolls back if it raises.
+
+        Blocks can nest, so callers can wrap several write methods in one
+        transaction (one commit for the lot). A nested block runs in a
+        savepoint of the enclosing transaction: its changes are undone if
+        it raises and committed only with the outermost block.
+        """
+        with self.get_connection() as conn:
+            if conn.in_transaction:
+                conn.execute("SAVEPOINT write_transaction")
+                try:
+                    yield conn
+                except BaseException:
+                    conn.execute("ROLLBACK TO write_transaction")
+                    conn.execute("RELEASE write_transaction")
+                    raise
+                conn.execute("RELEASE write_transaction")
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _iter_query(self, query: str, params=(), row_to_model=None) -> Iterator:
+        """Yield a query's rows, fetching FETCH_CHUNK_SIZE rows at a time.
+
+        Rows are plain tuples, passed through ``row_to_model`` if given. The
+        query runs on its own cursor with a cursor-level row factory, leaving
+        the connection's untouched, so callers may use other methods of this
+        instance while the generator is suspended.
+        """
+        cursor = self._thread_connection().cursor()
+        cursor.row_factory = None
+        cursor.arraysize = FETCH_CHUNK_SIZE
+        cursor.execute(query, params)
+        while chunk := cursor.fetchmany():
+            if row_to_model is None:
+                yield from chunk
+            else:
+                for row in chunk:
+                    yield row_to_model(row)
+
     def execute(self, query: str, params=None):
         """Execute a raw SQL query (for delete/update operations)."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             if params:
                 conn.execute(query, params)
             else:
                 conn.execute(query)
-            conn.commit()
+        # Raw statements may touch categorization_rules (e.g. review deletes)
+        # or accounts, so drop what is cached from them
+        self._rule_matcher = None
+        self._account_cache.clear()
+
+    def execute_many(self, statements: list[tuple[str, tuple]]):
+        """Execute several raw SQL statements in a single write transaction.
+
+        Args:
+            statements: List of (query, params) pairs, applied in order.
+                        Nothing is committed if any statement fails.
+        """
+        with self.write_transaction() as conn:
+            for query, params in statements:
+                conn.execute(query, params or ())
+        self._rule_matcher = None
+        self._account_cache.clear()
 
     def init_schema(self):
         """Initialize database schema from SQL file."""
@@ -169,61 +486,61 @@ class Database:
             schema_sql = f.read()
 
         with self.get_connection() as conn:
+            had_summary = self._table_exists(conn, "monthly_summary")
             conn.executescript(schema_sql)
-            conn.commit()
 
-    def seed_categories(self):
-        """Seed default categories with lilac-themed colors."""
-        categories = [
-            # Income
-            ("Salary", "Income", "#81C784", None),
-            ("Freelance", "Income", "#A5D6A7", None),
-            ("Investment Income", "Income", "#C8E6C9", None),
-            ("Other Income", "Income", "#E8F5E9", None),
-            # Expenses
-            ("Groceries", "Expenses", "#9B7EBD", None),
-            ("Dining & Restaurants", "Expenses", "#C8B6E2", None),
-            ("Transportation", "Expenses", "#7B68A6", None),
-            ("Housing", "Expenses", "#D5C6E8", None),
-            ("Healthcare", "Expenses", "#B39CD8", None),
-            ("Entertainment", "Expenses", "#E6D5F5", None),
-            ("Shopping", "Expenses", "#A890C8", None),
-            ("Subscriptions", "Expenses", "#BFA9D4", None),
-            ("Travel", "Expenses", "#9D85BA", None),
-            ("Personal Care", "Expenses", "#D0BFEA", None),
-            ("Education", "Expenses", "#C4B0DC", None),
-            ("Insurance", "Expenses", "#B8A4D0", None),
-            ("Gifts & Donations", "Expenses", "#D8CAE8", None),
-            ("Pets", "Expenses", "#CFC0E0", None),
-            ("Childcare & Kids", "Expenses", "#E0D4F0", None),
-            ("Home Improvement", "Expenses", "#A698C0", None),
-            ("Professional Services", "Expenses", "#9A8CB4", None),
-            ("Fees & Interest", "Expenses", "#8E80A8", None),
-            ("Taxes", "Expenses", "#82749C", None),
-            # Special
-            ("Uncategorized", "Special", "#BDBDBD", None),
-            ("Transfer", "Special", "#90A4AE", None),
-            ("Credit Card Payment", "Special", "#78909C", None),
-        ]
+        # The triggers only track changes from now on, so a table created on
+        # a database with transactions must be filled from them
+        if not had_summary:
+            with self.write_transaction() as conn:
+                for statement in MONTHLY_SUMMARY_REBUILD:
+                    conn.execute(statement)
+
+    def _table_exists(self, conn: sqlite3.Connection, name: str) -> bool:
+        """Check whether the database has a table called ``name``."""
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (name,),
+        ).fetchone()
+        return row is not None
+
+    def post_ingest_maintenance(self, vacuum_pages: int = 1000):
+        """Reclaim free pages and refresh planner statistics after ingestion.
 
+        Run once an ingestion run is marked completed. Incremental vacuum only
+        has an effect on databases created with auto_vacuum = INCREMENTAL
+        (see schema.sql); on older databases it is a no-op.
+
+        Args:
+            vacuum_pages: Maximum number of free pages to reclaim.
+        """
         with self.get_connection() as conn:
-            for name, parent, color, icon in categories:
-                try:
-                    conn.execute(
-                        """
-                        INSERT OR IGNORE INTO categories (name, parent_category, color, icon)
-                        VALUES (?, ?, ?, ?)
-                        """,
-                        (name, parent, color, icon),
-                    )
-                except sqlite3.IntegrityError:
-                    pass
-            conn.commit()
+            # executescript steps each statement to completion, which
+            # incremental_vacuum needs to free more than one page
+            conn.executescript(
+                f"""
+                PRAGMA incremental_vacuum({int(vacuum_pages)});
+                ANALYZE transactions;
+                ANALYZE statements;
+                PRAGMA optimize;
+                """
+            )
+
+    def seed_categories(self):
+        """Seed default categories with lilac-themed colors."""
+        with self.write_transaction() as conn:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO categories (name, parent_category, color, icon)
+                VALUES (?, ?, ?, ?)
+                """,
+                DEFAULT_CATEGORIES,
+            )
 
     # Account methods
     def create_account(self, account: Account) -> int:
         """Create a new account and return its ID."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO accounts (account_name, account_type, bank_name, last_four, is_active)
@@ -237,45 +554,50 @@ class Database:
                     account.is_active,
                 ),
             )
-            conn.commit()
-            return cursor.lastrowid
+        self._account_cache.clear()
+        return cursor.lastrowid
 
     def get_account_by_name(self, account_name: str) -> Optional[Account]:
-        """Get account by name."""
-        with self.get_connection() as conn:
+        """Get account by name.
+
+        Found accounts are cached on this instance, since ingestion looks up
+        the same account for every statement, and each call returns a copy.
+        Misses are not cached, so a newly created account is picked up on the
+        next call. Writes through this instance clear the cache.
+        """
+        account = self._account_cache.get(account_name)
+        if account is not None:
+            return replace(account)
+
+        with self.bulk_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM accounts WHERE account_name = ?", (account_name,)
+                f"SELECT {ACCOUNT_COLUMNS} FROM accounts WHERE account_name = ?",
+                (account_name,),
             ).fetchone()
-            if row:
-                return Account(
-                    id=row["id"],
-                    account_name=row["account_name"],
-                    account_type=row["account_type"],
-                    bank_name=row["bank_name"],
-                    last_four=row["last_four"],
-                    is_active=bool(row["is_active"]),
-                    created_at=row["created_at"],
-                )
-            return None
+            if not row:
+                return None
+            account = self._row_to_account(row)
+            # A row seen inside an open write transaction may yet be rolled back
+            if not conn.in_transaction:
+                self._account_cache[account_name] = replace(account)
+            return account
 
     def get_all_accounts(self) -> list[Account]:
         """Get all active accounts."""
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM accounts WHERE is_active = 1 ORDER BY bank_name, account_name"
+                f"""
+                SELECT {ACCOUNT_COLUMNS} FROM accounts
+                WHERE is_active = 1 ORDER BY bank_name, account_name
+                """
             ).fetchall()
-            return [
-                Account(
-                    id=row["id"],
-                    account_name=row["account_name"],
-                    account_type=row["account_type"],
-                    bank_name=row["bank_name"],
-                    last_four=row["last_four"],
-                    is_active=bool(row["is_active"]),
-                    created_at=row["created_at"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_account(row) for row in rows]
+
+    def _row_to_account(self, row) -> Account:
+        """Convert a row selected with ACCOUNT_COLUMNS to an Account object."""
+        account = Account(*row)
+        account.is_active = bool(account.is_active)
+        return account
 
     # Statement methods
     def statement_exists(
@@ -292,7 +614,7 @@ class Database:
         Returns:
             True if statement exists, False otherwise
         """
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             if account_id is not None:
                 # Check compound key (file_hash, account_id) for consolidated statements
                 row = conn.execute(
@@ -308,7 +630,7 @@ class Database:
 
     def create_statement(self, statement: Statement) -> int:
         """Create a new statement and return its ID."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO statements
@@ -325,90 +647,133 @@ class Database:
                     statement.total_transactions,
                 ),
             )
-            conn.commit()
             return cursor.lastrowid
 
     # Transaction methods
     def transaction_exists(
         self, account_id: int, transaction_date: date, amount: float, merchant: str
     ) -> bool:
-        """Check if a transaction already exists."""
-        with self.get_connection() as conn:
-            row = conn.execute(
+        """Check if a transaction already exists.
+
+        Amounts are compared after round_amount on both sides, so rows stored
+        with more precision before amounts were rounded still match.
+        """
+        amount = round_amount(amount)
+        with self.bulk_connection() as conn:
+            rows = conn.execute(
                 """
-                SELECT 1 FROM transactions
-                WHERE account_id = ? AND transaction_date = ? AND amount = ? AND merchant_original = ?
+                SELECT amount FROM transactions
+                WHERE account_id = ? AND transaction_date = ? AND merchant_original = ?
                 """,
-                (account_id, transaction_date, amount, merchant),
-            ).fetchone()
-            return row is not None
+                (account_id, transaction_date, merchant),
+            )
+            return any(round_amount(stored) == amount for (stored,) in rows)
+
+    def get_transaction_keys(
+        self, account_id: int, start_date: date, end_date: date
+    ) -> set[tuple[str, float, str]]:
+        """Get the dedup keys of an account's transactions in a date range.
+
+        One query in place of a transaction_exists call per candidate row.
+
+        Returns:
+            Set of (transaction_date as ISO string, amount, merchant_original),
+            matching the transactions UNIQUE constraint for this account.
+            Amounts are passed through round_amount, like the amounts they are
+            compared with, so rows stored unrounded still match.
+        """
+        with self.bulk_connection() as conn:
+            return {
+                (transaction_date, round_amount(amount), merchant)
+                for transaction_date, amount, merchant in conn.execute(
+                    """
+                    SELECT transaction_date, amount, merchant_original
+                    FROM transactions
+                    WHERE account_id = ? AND transaction_date BETWEEN ? AND ?
+                    """,
+                    (account_id, start_date, end_date),
+                )
+            }
 
     def create_transaction(self, transaction: Transaction) -> int:
-        """Create a new transaction and return its ID."""
-        with self.get_connection() as conn:
+        """Create a new transaction and return its ID.
+
+        Raises:
+            ValueError: If transaction_type is set but not one of
+                TRANSACTION_TYPES. None is stored as NULL, as the CHECK allows.
+        """
+        if (
+            transaction.transaction_type is not None
+            and transaction.transaction_type not in TRANSACTION_TYPES
+        ):
+            raise ValueError(
+                f"Invalid transaction_type: {transaction.transaction_type!r}"
+            )
+        with self.write_transaction() as conn:
             cursor = conn.execute(
-                """
-                INSERT INTO transactions
-                (statement_id, account_id, transaction_date, post_date, amount, transaction_type,
-                 merchant_original, merchant_cleaned, description, category, confidence_score,
-                 flagged_for_review, notes)
+                f"""
+                INSERT INTO transactions ({TRANSACTION_INSERT_COLUMNS})
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    transaction.statement_id,
-                    transaction.account_id,
-                    transaction.transaction_date,
-                    transaction.post_date,
-                    transaction.amount,
-                    transaction.transaction_type,
-                    transaction.merchant_original,
-                    transaction.merchant_cleaned,
-                    transaction.description,
-                    transaction.category,
-                    transaction.confidence_score,
-                    transaction.flagged_for_review,
-                    transaction.notes,
-                ),
+                self._transaction_to_row(transaction),
             )
-            conn.commit()
             return cursor.lastrowid
 
     def create_transactions_batch(self, transactions: list[Transaction]) -> int:
         """Create multiple transactions in a batch. Returns count of inserted."""
-        inserted = 0
-        with self.get_connection() as conn:
-            for t in transactions:
-                try:
-                    conn.execute(
-                        """
-                        INSERT INTO transactions
-                        (statement_id, account_id, transaction_date, post_date, amount, transaction_type,
-                         merchant_original, merchant_cleaned, description, category, confidence_score,
-                         flagged_for_review, notes)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            t.statement_id,
-                            t.account_id,
-                            t.transaction_date,
-                            t.post_date,
-                            t.amount,
-                            t.transaction_type,
-                            t.merchant_original,
-                            t.merchant_cleaned,
-                            t.description,
-                            t.category,
-                            t.confidence_score,
-                            t.flagged_for_review,
-                            t.notes,
-                        ),
-                    )
-                    inserted += 1
-                except sqlite3.IntegrityError:
-                    # Duplicate transaction, skip
-                    pass
-            conn.commit()
-        return inserted
+        return self.create_transactions_raw(
+            [self._transaction_to_row(t) for t in transactions]
+        )
+
+    def create_transactions_raw(self, rows: list[tuple]) -> int:
+        """Insert pre-flattened transaction rows in one executemany call.
+
+        Fast path for ingestion that skips building Transaction objects.
+        Invalid rows (see partition_transaction_rows) are dropped before the
+        insert, and rows that duplicate an existing transaction are skipped
+        by the upsert clause, as in create_transactions_batch.
+
+        Args:
+            rows: Tuples in TRANSACTION_INSERT_COLUMNS order, with amounts
+                  already passed through round_amount.
+
+        Returns:
+            Count of inserted rows.
+        """
+        valid, _ = partition_transaction_rows(rows)
+        if not valid:
+            return 0
+        with self.write_transaction() as conn:
+            # rowcount sums changes() per row, which (unlike total_changes)
+            # leaves out the monthly_summary trigger writes
+            cursor = conn.executemany(
+                f"""
+                INSERT INTO transactions ({TRANSACTION_INSERT_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (account_id, transaction_date, amount, merchant_original)
+                DO NOTHING
+                """,
+                valid,
+            )
+            return cursor.rowcount
+
+    def _transaction_to_row(self, t: Transaction) -> tuple:
+        """Flatten a Transaction into TRANSACTION_INSERT_COLUMNS order."""
+        return (
+            t.statement_id,
+            t.account_id,
+            t.transaction_date,
+            t.post_date,
+            round_amount(t.amount),
+            t.transaction_type,
+            t.merchant_original,
+            t.merchant_cleaned,
+            t.description,
+            t.category,
+            t.confidence_score,
+            t.flagged_for_review,
+            t.notes,
+        )
 
     def update_transaction_category(
         self,
@@ -418,7 +783,7 @@ class Database:
         flagged: bool = False,
     ):
         """Update transaction category."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             conn.execute(
                 """
                 UPDATE transactions
@@ -427,61 +792,59 @@ class Database:
                 """,
                 (category, confidence_score, flagged, transaction_id),
             )
-            conn.commit()
 
     def get_flagged_transactions(self) -> list[Transaction]:
         """Get all transactions flagged for review."""
-        with self.get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM transactions
-                WHERE flagged_for_review = 1
-                ORDER BY transaction_date DESC
-                """
-            ).fetchall()
-            return [self._row_to_transaction(row) for row in rows]
+        return list(self.iter_flagged_transactions())
+
+    def iter_flagged_transactions(self) -> Iterator[Transaction]:
+        """Yield transactions flagged for review, fetching rows in chunks."""
+        yield from self._iter_query(
+            f"""
+            SELECT {TRANSACTION_COLUMNS} FROM transactions
+            WHERE flagged_for_review = 1
+            ORDER BY transaction_date DESC
+            """,
+            row_to_model=self._row_to_transaction,
+        )
 
     def get_uncategorized_transactions(self) -> list[Transaction]:
         """Get transactions without a category."""
-        with self.get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM transactions
-                WHERE category IS NULL OR category = 'Uncategorized'
-                ORDER BY transaction_date DESC
-                """
-            ).fetchall()
-            return [self._row_to_transaction(row) for row in rows]
+        return list(self.iter_uncategorized_transactions())
+
+    def iter_uncategorized_transactions(self) -> Iterator[Transaction]:
+        """Yield transactions without a category, fetching rows in chunks."""
+        yield from self._iter_query(
+            f"""
+            SELECT {TRANSACTION_COLUMNS} FROM transactions
+            WHERE category IS NULL OR category = 'Uncategorized'
+            ORDER BY transaction_date DESC
+            """,
+            row_to_model=self._row_to_transaction,
+        )
 
     def _row_to_transaction(self, row) -> Transaction:
-        """Convert a database row to a Transaction object."""
-        return Transaction(
-            id=row["id"],
-            statement_id=row["statement_id"],
-            account_id=row["account_id"],
-            transaction_date=row["transaction_date"],
-            post_date=row["post_date"],
-            amount=row["amount"],
-            transaction_type=row["transaction_type"],
-            merchant_original=row["merchant_original"],
-            merchant_cleaned=row["merchant_cleaned"],
-            description=row["description"],
-            category=row["category"],
-            confidence_score=row["confidence_score"],
-            flagged_for_review=bool(row["flagged_for_review"]),
-            notes=row["notes"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
+        """Convert a row selected with TRANSACTION_COLUMNS to a Transaction object."""
+        transaction = Transaction(*row)
+        transaction.flagged_for_review = bool(transaction.flagged_for_review)
+        return transaction
 
     # Categorization rules methods
     def get_all_rules(self) -> list[CategorizationRule]:
         """Get all categorization rules."""
-        with self.get_connection() as conn:
-            rows = conn.execute(
-                "SELECT * FROM categorization_rules ORDER BY times_applied DESC"
-            ).fetchall()
-            return [self._row_to_rule(row) for row in rows]
+        return list(self.iter_rules())
+
+    def iter_rules(self) -> Iterator[CategorizationRule]:
+        """Yield all categorization rules, fetching rows in chunks."""
+        with self.bulk_connection() as conn:
+            columns = self._rule_columns(conn)
+        yield from self._iter_query(
+            f"""
+            SELECT {columns} FROM categorization_rules
+            ORDER BY times_applied DESC
+            """,
+            row_to_model=self._row_to_rule,
+        )
 
     def find_matching_rule(
         self, merchant: str, transaction: Optional[Transaction] = None
@@ -498,54 +861,77 @@ class Database:
             2. More specific patterns (longer)
             3. Higher accuracy scores
         """
-        with self.get_connection() as conn:
-            # Order by user_confirmed DESC, then pattern length, then accuracy
-            rows = conn.execute(
-                """
-                SELECT * FROM categorization_rules
-                ORDER BY user_confirmed DESC, LENGTH(merchant_pattern) DESC, accuracy_score DESC NULLS LAST
-                """
-            ).fetchall()
+        combined, rules, patterns = self._get_rule_matcher()
+        if not rules:
+            return None
 
-            for row in rows:
-                pattern = row["merchant_pattern"]
-                # Convert SQL LIKE pattern to comparison
-                # Pattern like "WHOLEFDS*" should match "WHOLEFDS MARKET #123"
-                sql_pattern = pattern.replace("*", "%")
-                match_row = conn.execute(
-                    "SELECT ? LIKE ?", (merchant.upper(), sql_pattern.upper())
-                ).fetchone()
+        # Pattern like "WHOLEFDS*" should match "WHOLEFDS MARKET #123"
+        merchant_upper = merchant.upper()
+        match = combined.match(merchant_upper)
+        if match is None:
+            return None
+
+        # The combined regex finds the highest-priority match; later rules are
+        # only checked if that one is rejected by its complex conditions
+        for index in range(int(match.lastgroup[1:]), len(rules)):
+            if not patterns[index].match(merchant_upper):
+                continue
+            rule = rules[index]
+
+            # If transaction provided, check amount and account filters
+            if transaction:
+                # Check min amount
+                if (
+                    rule.min_amount is not None
+                    and transaction.amount > -rule.min_amount
+                ):
+                    continue
+                # Check max amount
+                if (
+                    rule.max_amount is not None
+                    and transaction.amount < -rule.max_amount
+                ):
+                    continue
+                # Check account type filter
+                if rule.account_type_filter:
+                    # Would need to fetch account info - for now, skip
+                    pass
 
-                if match_row[0]:
-                    # Pattern matches - now check complex conditions if present
-                    rule = self._row_to_rule(row)
-
-                    # If transaction provided, check amount and account filters
-                    if transaction:
-                        # Check min amount
-                        if (
-                            rule.min_amount is not None
-                            and transaction.amount > -rule.min_amount
-                        ):
-                            continue
-                        # Check max amount
-                        if (
-                            rule.max_amount is not None
-                            and transaction.amount < -rule.max_amount
-                        ):
-                            continue
-                        # Check account type filter
-                        if rule.account_type_filter:
-                            # Would need to fetch account info - for now, skip
-                            pass
-
-                    return rule
+            # A copy, so callers can't alter the cached rule
+            return replace(rule)
 
         return None
 
+    def _get_rule_matcher(
+        self,
+    ) -> tuple[re.Pattern, list[CategorizationRule], list[re.Pattern]]:
+        """Return (combined regex, rules, per-rule regexes) in priority order.
+
+        Built from the database on first use and cached until a rule changes
+        (including its usage counters).
+        """
+        if self._rule_matcher is None:
+            with self.bulk_connection() as conn:
+                # Order by user_confirmed DESC, then pattern length, then accuracy
+                rows = conn.execute(
+                    f"""
+                    SELECT {self._rule_columns(conn)} FROM categorization_rules
+                    ORDER BY user_confirmed DESC, LENGTH(merchant_pattern) DESC, accuracy_score DESC NULLS LAST
+                    """
+                ).fetchall()
+            rules = [self._row_to_rule(row) for row in rows]
+            sources = [_pattern_to_regex(rule.merchant_pattern) for rule in rules]
+            combined = re.compile(
+                "|".join(f"(?P<r{i}>{source})" for i, source in enumerate(sources)),
+                re.DOTALL,
+            )
+            patterns = [re.compile(source, re.DOTALL) for source in sources]
+            self._rule_matcher = (combined, rules, patterns)
+        return self._rule_matcher
+
     def create_rule(self, rule: CategorizationRule) -> int:
         """Create a new categorization rule with support for complex conditions."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO categorization_rules
@@ -567,12 +953,12 @@ class Database:
                     1 if rule.auto_created else 0,
                 ),
             )
-            conn.commit()
-            return cursor.lastrowid
+        self._rule_matcher = None
+        return cursor.lastrowid
 
     def increment_rule_usage(self, rule_id: int):
         """Increment the times_applied counter for a rule."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             conn.execute(
                 """
                 UPDATE categorization_rules
@@ -581,13 +967,16 @@ class Database:
                 """,
                 (rule_id,),
             )
-            conn.commit()
+        self._rule_matcher = None
 
     def get_rule_by_pattern(self, pattern: str) -> Optional[CategorizationRule]:
         """Check if a rule with this pattern already exists."""
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             row = conn.execute(
-                "SELECT * FROM categorization_rules WHERE merchant_pattern = ?",
+                f"""
+                SELECT {self._rule_columns(conn)} FROM categorization_rules
+                WHERE merchant_pattern = ?
+                """,
                 (pattern,),
             ).fetchone()
             if row:
@@ -601,7 +990,7 @@ class Database:
             rule_id: ID of the rule
             accepted: True if user accepted the categorization, False if rejected
         """
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             if accepted:
                 # Increment times_applied, improve accuracy score
                 conn.execute(
@@ -625,62 +1014,73 @@ class Database:
                     """,
                     (rule_id,),
                 )
-            conn.commit()
+        self._rule_matcher = None
 
     def _row_to_rule(self, row) -> CategorizationRule:
-        """Convert a database row to a CategorizationRule object."""
-        return CategorizationRule(
-            id=row["id"],
-            merchant_pattern=row["merchant_pattern"],
-            category=row["category"],
-            confidence=row["confidence"],
-            times_applied=row["times_applied"],
-            last_used=row["last_used"],
-            created_at=row["created_at"],
-            notes=row["notes"],
-            rule_type=row.get("rule_type", "pattern"),
-            conditions=row.get("conditions"),
-            min_amount=row.get("min_amount"),
-            max_amount=row.get("max_amount"),
-            account_type_filter=row.get("account_type_filter"),
-            user_confirmed=bool(row.get("user_confirmed", 0)),
-            auto_created=bool(row.get("auto_created", 0)),
-            times_rejected=row.get("times_rejected", 0),
-            accuracy_score=row.get("accuracy_score"),
-        )
+        """Convert a row selected with _rule_columns() to a CategorizationRule."""
+        rule = CategorizationRule(*row)
+        rule.user_confirmed = bool(rule.user_confirmed)
+        rule.auto_created = bool(rule.auto_created)
+        return rule
+
+    def _rule_columns(self, conn: sqlite3.Connection) -> str:
+        """Return the SELECT list for categorization rules on this database.
+
+        Columns added by migration 002 are missing on older databases. They
+        are selected as their dataclass defaults instead, so rows always
+        unpack positionally into CategorizationRule. Resolved once per
+        instance via PRAGMA table_info.
+        """
+        if self._rule_select is None:
+            present = {
+                row[1]
+                for row in conn.execute("PRAGMA table_info(categorization_rules)")
+            }
+            columns = []
+            for field in fields(CategorizationRule):
+                if field.name in present:
+                    columns.append(field.name)
+                    continue
+                default = field.default
+                if default is None:
+                    literal = "NULL"
+                elif isinstance(default, str):
+                    literal = f"'{default}'"
+                elif isinstance(default, bool):
+                    literal = str(int(default))
+                else:
+                    literal = str(default)
+                columns.append(f"{literal} AS {field.name}")
+            self._rule_select = ", ".join(columns)
+        return self._rule_select
 
     # Category methods
     def get_all_categories(self) -> list[Category]:
         """Get all active categories."""
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             rows = conn.execute(
-                "SELECT * FROM categories WHERE is_active = 1 ORDER BY parent_category, name"
+                f"""
+                SELECT {CATEGORY_COLUMNS} FROM categories
+                WHERE is_active = 1 ORDER BY parent_category, name
+                """
             ).fetchall()
-            return [
-                Category(
-                    id=row["id"],
-                    name=row["name"],
-                    parent_category=row["parent_category"],
-                    color=row["color"],
-                    icon=row["icon"],
-                    is_active=bool(row["is_active"]),
-                    created_at=row["created_at"],
-                )
-                for row in rows
-            ]
+            categories = [Category(*row) for row in rows]
+            for category in categories:
+                category.is_active = bool(category.is_active)
+            return categories
 
     def get_category_names(self) -> list[str]:
         """Get just category names for categorization."""
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             rows = conn.execute(
                 "SELECT name FROM categories WHERE is_active = 1 ORDER BY name"
             ).fetchall()
-            return [row["name"] for row in rows]
+            return [row[0] for row in rows]
 
     # Ingestion log methods
     def create_ingestion_log(self, log: IngestionLog) -> int:
         """Create a new ingestion log entry and return its ID."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO ingestion_log (started_at, status)
@@ -688,7 +1088,6 @@ class Database:
                 """,
                 (log.started_at, log.status),
             )
-            conn.commit()
             return cursor.lastrowid
 
     def update_ingestion_log(
@@ -703,7 +1102,7 @@ class Database:
         summary: Optional[str] = None,
     ):
         """Update an ingestion log entry."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             conn.execute(
                 """
                 UPDATE ingestion_log
@@ -723,66 +1122,40 @@ class Database:
                     log_id,
                 ),
             )
-            conn.commit()
 
     def get_last_ingestion(self) -> Optional[IngestionLog]:
         """Get the most recent completed ingestion log."""
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             row = conn.execute(
-                """
-                SELECT * FROM ingestion_log
+                f"""
+                SELECT {INGESTION_LOG_COLUMNS} FROM ingestion_log
                 WHERE status = 'completed'
                 ORDER BY completed_at DESC
                 LIMIT 1
                 """
             ).fetchone()
             if row:
-                return IngestionLog(
-                    id=row["id"],
-                    started_at=row["started_at"],
-                    completed_at=row["completed_at"],
-                    status=row["status"],
-                    pdfs_processed=row["pdfs_processed"],
-                    transactions_added=row["transactions_added"],
-                    transactions_updated=row["transactions_updated"],
-                    errors=row["errors"],
-                    summary=row["summary"],
-                    created_at=row["created_at"],
-                )
+                return IngestionLog(*row)
             return None
 
     def get_ingestion_history(self, limit: int = 10) -> list[IngestionLog]:
         """Get recent ingestion history."""
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             rows = conn.execute(
-                """
-                SELECT * FROM ingestion_log
+                f"""
+                SELECT {INGESTION_LOG_COLUMNS} FROM ingestion_log
                 ORDER BY started_at DESC
                 LIMIT ?
                 """,
                 (limit,),
             ).fetchall()
-            return [
-                IngestionLog(
-                    id=row["id"],
-                    started_at=row["started_at"],
-                    completed_at=row["completed_at"],
-                    status=row["status"],
-                    pdfs_processed=row["pdfs_processed"],
-                    transactions_added=row["transactions_added"],
-                    transactions_updated=row["transactions_updated"],
-                    errors=row["errors"],
-                    summary=row["summary"],
-                    created_at=row["created_at"],
-                )
-                for row in rows
-            ]
+            return [IngestionLog(*row) for row in rows]
 
     # === Batch Tracking Methods ===
 
     def create_batch(self, batch: IngestionBatch) -> int:
         """Create a new batch record for tracking batch progress."""
-        with self.get_connection() as conn:
+        with self.write_transaction() as conn:
             cursor = conn.execute(
                 """
                 INSERT INTO ingestion_batches (
@@ -802,40 +1175,50 @@ class Database:
                     batch.summary,
                 ),
             )
-            conn.commit()
             return cursor.lastrowid
 
     def update_batch_status(self, batch_id: int, status: str, **kwargs):
         """Update batch status and optional metrics."""
-        updates = ["status = ?"]
-        params = [status]
-
-        if "completed_at" in kwargs:
-            updates.append("completed_at = ?")
-            params.append(kwargs["completed_at"])
-        if "files_processed" in kwargs:
-            updates.append("files_processed = ?")
-            params.append(kwargs["files_processed"])
-        if "files_failed" in kwargs:
-            updates.append("files_failed = ?")
-            params.append(kwargs["files_failed"])
-        if "summary" in kwargs:
-            updates.append("summary = ?")
-            params.append(kwargs["summary"])
-
-        params.append(batch_id)
-
-        with self.get_connection() as conn:
+        columns = tuple(c for c in BATCH_UPDATE_COLUMNS if c in kwargs)
+        with self.write_transaction() as conn:
             conn.execute(
-                f"UPDATE ingestion_batches SET {', '.join(updates)} WHERE id = ?",
-                params,
+                _BATCH_UPDATE_SQL[frozenset(columns)],
+                [status, *(kwargs[c] for c in columns), batch_id],
             )
-            conn.commit()
 
     def create_file_status(self, file_status: IngestionFileStatus) -> int:
         """Track individual file processing status."""
-        with self.get_connection() as conn:
-            cursor = conn.execute(
+        return self.create_file_statuses_batch([file_status])[0]
+
+    def create_file_statuses_batch(
+        self, statuses: list[IngestionFileStatus]
+    ) -> list[int]:
+        """Track processing status for many files in one transaction.
+
+        Returns:
+            The new row ids, in the order of ``statuses``.
+        """
+        rows = [
+            (
+                s.ingestion_log_id,
+                s.batch_id,
+                s.file_name,
+                s.file_hash,
+                s.file_path,
+                s.status,
+                s.started_at,
+                s.completed_at,
+                s.error_message,
+                s.statement_id,
+                s.transactions_inserted,
+            )
+            for s in statuses
+        ]
+        if not rows:
+            return []
+
+        with self.write_transaction() as conn:
+            conn.executemany(
                 """
                 INSERT INTO ingestion_file_status (
                     ingestion_log_id, batch_id, file_name, file_hash, file_path,
@@ -844,165 +1227,184 @@ class Database:
                 )
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    file_status.ingestion_log_id,
-                    file_status.batch_id,
-                    file_status.file_name,
-                    file_status.file_hash,
-                    file_status.file_path,
-                    file_status.status,
-                    file_status.started_at,
-                    file_status.completed_at,
-                    file_status.error_message,
-                    file_status.statement_id,
-                    file_status.transactions_inserted,
-                ),
+                rows,
             )
-            conn.commit()
-            return cursor.lastrowid
+            # Rowids are assigned consecutively while this transaction holds
+            # the write lock, so the batch ends at last_insert_rowid()
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        return list(range(last_id - len(rows) + 1, last_id + 1))
 
     def update_file_status(self, file_id: int, status: str, **kwargs):
         """Update file status and optional fields."""
-        updates = ["status = ?"]
-        params = [status]
-
-        if "started_at" in kwargs:
-            updates.append("started_at = ?")
-            params.append(kwargs["started_at"])
-        if "completed_at" in kwargs:
-            updates.append("completed_at = ?")
-            params.append(kwargs["completed_at"])
-        if "error_message" in kwargs:
-            updates.append("error_message = ?")
-            params.append(kwargs["error_message"])
-        if "statement_id" in kwargs:
-            updates.append("statement_id = ?")
-            params.append(kwargs["statement_id"])
-        if "transactions_inserted" in kwargs:
-            updates.append("transactions_inserted = ?")
-            params.append(kwargs["transactions_inserted"])
-
-        params.append(file_id)
+        self.update_file_statuses_batch([(file_id, status, kwargs)])
 
-        with self.get_connection() as conn:
-            conn.execute(
-                f"UPDATE ingestion_file_status SET {', '.join(updates)} WHERE id = ?",
-                params,
-            )
-            conn.commit()
+    def update_file_statuses_batch(self, transitions: list[tuple[int, str, dict]]):
+        """Apply many file status updates in one transaction.
+
+        Args:
+            transitions: ``(file_id, status, fields)`` tuples, where ``fields``
+                takes the same optional keys as update_file_status. Updates
+                setting the same columns share one executemany call.
+        """
+        groups: dict[tuple[str, ...], list[list]] = {}
+        for file_id, status, fields in transitions:
+            columns = tuple(c for c in FILE_STATUS_UPDATE_COLUMNS if c in fields)
+            params = [status, *(fields[c] for c in columns), file_id]
+            groups.setdefault(columns, []).append(params)
+
+        with self.write_transaction() as conn:
+            for columns, rows in groups.items():
+                conn.executemany(_FILE_STATUS_UPDATE_SQL[frozenset(columns)], rows)
 
     def get_pending_files(self, log_id: int) -> list[IngestionFileStatus]:
         """Get files that need processing (pending or failed status)."""
-        with self.get_connection() as conn:
-            rows = conn.execute(
-                """
-                SELECT * FROM ingestion_file_status
-                WHERE ingestion_log_id = ? AND status IN ('pending', 'failed')
-                ORDER BY id
-                """,
-                (log_id,),
-            ).fetchall()
+        return list(self.iter_pending_files(log_id))
+
+    def iter_pending_files(self, log_id: int) -> Iterator[IngestionFileStatus]:
+        """Yield files that need processing, fetching rows in chunks."""
+        yield from self._iter_query(
+            f"""
+            SELECT {FILE_STATUS_COLUMNS} FROM ingestion_file_status
+            WHERE ingestion_log_id = ? AND status IN ('pending', 'failed')
+            ORDER BY id
+            """,
+            (log_id,),
+            row_to_model=self._row_to_file_status,
+        )
 
-            return [
-                IngestionFileStatus(
-                    id=row["id"],
-                    ingestion_log_id=row["ingestion_log_id"],
-                    batch_id=row["batch_id"],
-                    file_name=row["file_name"],
-                    file_hash=row["file_hash"],
-                    file_path=row["file_path"],
-                    status=row["status"],
-                    started_at=row["started_at"],
-                    completed_at=row["completed_at"],
-                    error_message=row["error_message"],
-                    statement_id=row["statement_id"],
-                    transactions_inserted=row["transactions_inserted"],
-                )
-                for row in rows
-            ]
+    def _row_to_file_status(self, row) -> IngestionFileStatus:
+        """Convert a row selected with FILE_STATUS_COLUMNS to IngestionFileStatus."""
+        return IngestionFileStatus(*row)
+
+    def iter_pending_file_rows(self, log_id: int) -> Iterator[tuple]:
+        """Yield ``(id, file_name, file_hash, file_path)`` for files needing work.
+
+        Lightweight counterpart to get_pending_files for the ingestion loop:
+        plain tuples of the columns needed to process a file, fetched in chunks.
+        """
+        yield from self._iter_query(
+            f"""
+            SELECT {PENDING_FILE_COLUMNS} FROM ingestion_file_status
+            WHERE ingestion_log_id = ? AND status IN ('pending', 'failed')
+            ORDER BY id
+            """,
+            (log_id,),
+        )
 
     def get_batch_progress(self, batch_id: int) -> dict:
         """Get current batch progress metrics."""
-        with self.get_connection() as conn:
+        with self.bulk_connection() as conn:
             batch_row = conn.execute(
-                "SELECT * FROM ingestion_batches WHERE id = ?", (batch_id,)
+                """
+                SELECT batch_number, status, total_files, files_processed, files_failed
+                FROM ingestion_batches WHERE id = ?
+                """,
+                (batch_id,),
             ).fetchone()
 
-            if not batch_row:
-                return {}
+        if not batch_row:
+            return {}
 
-            return {
-                "batch_number": batch_row["batch_number"],
-                "status": batch_row["status"],
-                "total_files": batch_row["total_files"],
-                "files_processed": batch_row["files_processed"],
-                "files_failed": batch_row["files_failed"],
-            }
+        batch_number, status, total_files, files_processed, files_failed = batch_row
+        return {
+            "batch_number": batch_number,
+            "status": status,
+            "total_files": total_files,
+            "files_processed": files_processed,
+            "files_failed": files_failed,
+        }
 
     def detect_resume_state(self, log_id: int) -> dict:
         """Check if this is a resume scenario and return state."""
-        with self.get_connection() as conn:
-            # Check for existing batch records
-            batches = conn.execute(
+        with self.bulk_connection() as conn:
+            # Whether any batches exist, and the first incomplete one
+            has_batches, current_batch = conn.execute(
                 """
-                SELECT * FROM ingestion_batches
-                WHERE ingestion_log_id = ?
-                ORDER BY batch_number
+                SELECT
+                    EXISTS (
+                        SELECT 1 FROM ingestion_batches WHERE ingestion_log_id = ?
+                    ),
+                    (
+                        SELECT MIN(batch_number) FROM ingestion_batches
+                        WHERE ingestion_log_id = ? AND status IN ('pending', 'processing')
+                    )
                 """,
-                (log_id,),
-            ).fetchall()
+                (log_id, log_id),
+            ).fetchone()
 
-            if not batches:
+            if not has_batches:
                 return {"is_resume": False}
 
-            # Find incomplete batch
-            incomplete_batch = None
-            for batch in batches:
-                if batch["status"] in ("pending", "processing"):
-                    incomplete_batch = batch
-                    break
-
-            if not incomplete_batch:
+            if current_batch is None:
                 return {"is_resume": False, "reason": "All batches completed"}
 
-            # Get file statuses
-            files = conn.execute(
+            completed_files = [
+                row[0]
+                for row in conn.execute(
+                    """
+                    SELECT file_hash FROM ingestion_file_status
+                    WHERE ingestion_log_id = ? AND status = 'completed'
+                    ORDER BY id
+                    """,
+                    (log_id,),
+                )
+            ]
+
+        # Rows to process are returned to the caller, so keep name access
+        with self.get_connection() as conn:
+            files_to_process = conn.execute(
                 """
                 SELECT file_name, status, file_hash, error_message
                 FROM ingestion_file_status
-                WHERE ingestion_log_id = ?
+                WHERE ingestion_log_id = ? AND status IN ('pending', 'failed')
                 ORDER BY id
                 """,
                 (log_id,),
             ).fetchall()
 
-            completed_files = [
-                f["file_hash"] for f in files if f["status"] == "completed"
-            ]
-            failed_files = [
-                {"file": f["file_name"], "error": f["error_message"]}
-                for f in files
-                if f["status"] == "failed"
-            ]
+        # Failed files are retried, so they are a subset of files_to_process
+        failed_files = [
+            {"file": f["file_name"], "error": f["error_message"]}
+            for f in files_to_process
+            if f["status"] == "failed"
+        ]
 
-            return {
-                "is_resume": True,
-                "current_batch": incomplete_batch["batch_number"],
-                "completed_files": completed_files,
-                "failed_files": failed_files,
-                "files_to_process": [
-                    f for f in files if f["status"] in ("pending", "failed")
-                ],
-            }
+        return {
+            "is_resume": True,
+            "current_batch": current_batch,
+            "completed_files": completed_files,
+            "failed_files": failed_files,
+            "files_to_process": files_to_process,
+        }
 
     def get_completed_file_hashes(self, log_id: int) -> set[str]:
         """Get set of file hashes that have been completed."""
-        with self.get_connection() as conn:
-            rows = conn.execute(
+        with self.bulk_connection() as conn:
+            cursor = conn.execute(
                 """
                 SELECT file_hash FROM ingestion_file_status
                 WHERE ingestion_log_id = ? AND status = 'completed'
                 """,
                 (log_id,),
-            ).fetchall()
-            return {row["file_hash"] for row in rows}
+            )
+            cursor.arraysize = FETCH_CHUNK_SIZE
+            hashes = set()
+            while chunk := cursor.fetchmany():
+                hashes.update(row[0] for row in chunk)
+            return hashes
+
+    def is_file_completed(self, log_id: int, file_hash: str) -> bool:
+        """Check whether a file has already been completed in an ingestion run.
+
+        Prefer this to get_completed_file_hashes when checking a single file.
+        """
+        with self.bulk_connection() as conn:
+            row = conn.execute(
+                """
+                SELECT 1 FROM ingestion_file_status
+                WHERE ingestion_log_id = ? AND file_hash = ? AND status = 'completed'
+                LIMIT 1
+                """,
+                (log_id, file_hash),
+            ).fetchone()
+            return row is not None
@@ -1,5 +1,9 @@
 -- Lavender Ledger Database Schema
 
+-- Must run before any table is created; lets post_ingest_maintenance()
+-- reclaim free pages with PRAGMA incremental_vacuum
+PRAGMA auto_vacuum = INCREMENTAL;
+
 -- Schema migrations table: Track applied migrations
 CREATE TABLE IF NOT EXISTS schema_migrations (
     version INTEGER PRIMARY KEY,
@@ -74,6 +78,90 @@ CREATE INDEX IF NOT EXISTS idx_transaction_category ON transactions(category);
 CREATE INDEX IF NOT EXISTS idx_transaction_flagged ON transactions(flagged_for_review);
 CREATE INDEX IF NOT EXISTS idx_transaction_account ON transactions(account_id);
 CREATE INDEX IF NOT EXISTS idx_transaction_statement ON transactions(statement_id);
+-- Partial indexes for the review queues (flagged / uncategorized), newest first
+CREATE INDEX IF NOT EXISTS idx_transaction_flagged_date
+    ON transactions(flagged_for_review, transaction_date DESC) WHERE flagged_for_review = 1;
+CREATE INDEX IF NOT EXISTS idx_transaction_uncategorized_date
+    ON transactions(transaction_date DESC) WHERE category IS NULL OR category = 'Uncategorized';
+
+-- Monthly totals per account, maintained by the triggers below so the
+-- dashboard summary reads a few rows instead of scanning the month.
+-- Income/expenses follow get_monthly_summary: payments and transfers excluded.
+CREATE TABLE IF NOT EXISTS monthly_summary (
+    month TEXT NOT NULL,  -- 'YYYY-MM'
+    account_id INTEGER NOT NULL,
+    total_income DECIMAL(12, 2) NOT NULL DEFAULT 0,
+    total_expenses DECIMAL(12, 2) NOT NULL DEFAULT 0,  -- positive magnitude
+    transaction_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (month, account_id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_monthly_summary_insert
+AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO monthly_summary (month, account_id, total_income, total_expenses, transaction_count)
+    VALUES (
+        substr(NEW.transaction_date, 1, 7),
+        NEW.account_id,
+        CASE WHEN NEW.amount > 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.amount < 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN -NEW.amount ELSE 0 END,
+        1
+    )
+    ON CONFLICT (month, account_id) DO UPDATE SET
+        total_income = total_income + excluded.total_income,
+        total_expenses = total_expenses + excluded.total_expenses,
+        transaction_count = transaction_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_monthly_summary_delete
+AFTER DELETE ON transactions
+BEGIN
+    UPDATE monthly_summary SET
+        total_income = total_income
+            - CASE WHEN OLD.amount > 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN OLD.amount ELSE 0 END,
+        total_expenses = total_expenses
+            - CASE WHEN OLD.amount < 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN -OLD.amount ELSE 0 END,
+        transaction_count = transaction_count - 1
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id;
+    DELETE FROM monthly_summary
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id
+    AND transaction_count = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_monthly_summary_update
+AFTER UPDATE OF account_id, transaction_date, amount, transaction_type ON transactions
+BEGIN
+    UPDATE monthly_summary SET
+        total_income = total_income
+            - CASE WHEN OLD.amount > 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN OLD.amount ELSE 0 END,
+        total_expenses = total_expenses
+            - CASE WHEN OLD.amount < 0 AND OLD.transaction_type NOT IN ('payment', 'transfer')
+                   THEN -OLD.amount ELSE 0 END,
+        transaction_count = transaction_count - 1
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id;
+    DELETE FROM monthly_summary
+    WHERE month = substr(OLD.transaction_date, 1, 7) AND account_id = OLD.account_id
+    AND transaction_count = 0;
+    INSERT INTO monthly_summary (month, account_id, total_income, total_expenses, transaction_count)
+    VALUES (
+        substr(NEW.transaction_date, 1, 7),
+        NEW.account_id,
+        CASE WHEN NEW.amount > 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN NEW.amount ELSE 0 END,
+        CASE WHEN NEW.amount < 0 AND NEW.transaction_type NOT IN ('payment', 'transfer')
+             THEN -NEW.amount ELSE 0 END,
+        1
+    )
+    ON CONFLICT (month, account_id) DO UPDATE SET
+        total_income = total_income + excluded.total_income,
+        total_expenses = total_expenses + excluded.total_expenses,
+        transaction_count = transaction_count + 1;
+END;
 
 -- Categorization rules table: Learned patterns for auto-categorization
 CREATE TABLE IF NOT EXISTS categorization_rules (
@@ -105,3 +193,49 @@ CREATE TABLE IF NOT EXISTS ingestion_log (
 
 CREATE INDEX IF NOT EXISTS idx_ingestion_log_completed ON ingestion_log(completed_at);
 CREATE INDEX IF NOT EXISTS idx_ingestion_log_status ON ingestion_log(status);
+
+-- Batch and per-file progress of an ingestion run, so an interrupted run
+-- can resume where it stopped
+CREATE TABLE IF NOT EXISTS ingestion_batches (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingestion_log_id INTEGER NOT NULL,
+    batch_number INTEGER NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    completed_at TIMESTAMP,
+    status TEXT DEFAULT 'pending',
+    total_files INTEGER DEFAULT 0,
+    files_processed INTEGER DEFAULT 0,
+    files_failed INTEGER DEFAULT 0,
+    summary TEXT,
+    FOREIGN KEY (ingestion_log_id) REFERENCES ingestion_log(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_ingestion_batches_log_status
+    ON ingestion_batches(ingestion_log_id, status, batch_number);
+
+CREATE TABLE IF NOT EXISTS ingestion_file_status (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ingestion_log_id INTEGER NOT NULL,
+    batch_id INTEGER,
+    file_name TEXT NOT NULL,
+    file_hash TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    status TEXT DEFAULT 'pending',
+    started_at TIMESTAMP,
+    completed_at TIMESTAMP,
+    error_message TEXT,
+    statement_id INTEGER,
+    transactions_inserted INTEGER,
+    FOREIGN KEY (ingestion_log_id) REFERENCES ingestion_log(id),
+    FOREIGN KEY (batch_id) REFERENCES ingestion_batches(id),
+    FOREIGN KEY (statement_id) REFERENCES statements(id)
+);
+
+-- Resume/progress lookups: all files of a run by status, the files still to
+-- process (pending/failed), and the hashes of completed files
+CREATE INDEX IF NOT EXISTS idx_ifs_log_status
+    ON ingestion_file_status(ingestion_log_id, status, id);
+CREATE INDEX IF NOT EXISTS idx_ifs_pending
+    ON ingestion_file_status(ingestion_log_id, id) WHERE status IN ('pending', 'failed');
+CREATE INDEX IF NOT EXISTS idx_ifs_completed
+    ON ingestion_file_status(ingestion_log_id, file_hash) WHERE status = 'completed';
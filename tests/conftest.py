@@ -1,24 +1,64 @@
 """Shared test fixtures for Lavender Ledger tests."""
 
 import json
+import os
 import pytest
+import shutil
 import tempfile
 from pathlib import Path
-from datetime import date
-
-from src.database.models import Database, Account, Transaction, Statement
+from datetime import date, datetime
+
+from src.database.models import (
+    Database,
+    Account,
+    Transaction,
+    Statement,
+    IngestionLog,
+    TEST_FAST_ENV,
+)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_test_databases():
+    """Let writable test connections skip fsync (see TEST_FAST_ENV)."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv(TEST_FAST_ENV, "1")
+        yield
+
+
+@pytest.fixture(scope="session")
+def _db_dir(tmp_path_factory):
+    """Directory for test databases, on memory-backed /dev/shm when available.
+
+    Tests need no durability, so this avoids disk I/O while keeping real
+    files for read-only URIs, journal files and the script subprocess tests.
+    """
+    shm = Path("/dev/shm")
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        db_dir = Path(tempfile.mkdtemp(prefix="lavender-tests-", dir=shm))
+        yield db_dir
+        shutil.rmtree(db_dir, ignore_errors=True)
+    else:
+        yield tmp_path_factory.mktemp("db")
+
+
+@pytest.fixture(scope="session")
+def _seeded_template_db(_db_dir):
+    """Build a schema-initialized, category-seeded database once per session."""
+    db_path = _db_dir / "template.db"
+    db = Database(str(db_path))
+    db.init_schema()
+    db.seed_categories()
+    db.close()
+    return db_path
 
 
 @pytest.fixture
-def temp_db():
-    """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
-
-    # Initialize schema
-    db = Database(db_path)
-    db.init_schema()
-    db.seed_categories()
+def temp_db(_seeded_template_db, _db_dir):
+    """Create a temporary database for testing, copied from the seeded template."""
+    fd, db_path = tempfile.mkstemp(suffix=".db", dir=_db_dir)
+    os.close(fd)
+    shutil.copyfile(_seeded_template_db, db_path)
 
     yield db_path
 
@@ -29,7 +69,9 @@ def temp_db():
 @pytest.fixture
 def db_instance(temp_db):
     """Return a Database instance connected to temp database."""
-    return Database(temp_db)
+    db = Database(temp_db)
+    yield db
+    db.close()
 
 
 @pytest.fixture
@@ -67,6 +109,18 @@ def test_statement(test_account):
     return statement_id, account_id, db
 
 
+@pytest.fixture
+def ingestion_db(db_instance):
+    """Create a running ingestion log to track batches and files against.
+
+    Returns (log_id, Database).
+    """
+    log_id = db_instance.create_ingestion_log(
+        IngestionLog(id=None, started_at=datetime(2025, 12, 31, 9, 0))
+    )
+    return log_id, db_instance
+
+
 @pytest.fixture
 def sample_parsed_json():
     """Sample parsed statement JSON (as returned by parsing skill)."""
@@ -113,6 +167,12 @@ def sample_parsed_json():
     }
 
 
+@pytest.fixture
+def sample_parsed_json_text(sample_parsed_json):
+    """sample_parsed_json serialized once, for tests that feed it to stdin."""
+    return json.dumps(sample_parsed_json)
+
+
 @pytest.fixture
 def sample_categorizations():
     """Sample categorization results JSON (as returned by categorization skill)."""
@@ -4,19 +4,43 @@ Since Lavender Ledger uses server-side rendering with minimal JavaScript,
 Flask integration tests are the primary way to test the frontend.
 """
 
+import os
 import pytest
+import shutil
 from datetime import date
 
 from src.dashboard.app import create_app
 from src.database.models import Database, Account, Statement, Transaction
 
 
-@pytest.fixture
-def app(temp_db):
-    """Create Flask app for testing."""
-    # Use test database
+def install_database(source, target):
+    """Copy source to target as a new file.
+
+    The file is swapped in with os.replace rather than overwritten, so the
+    app's DashboardQueries sees a different file, reconnects and drops its
+    memoized results.
+    """
+    staged = target.with_name(target.name + ".staged")
+    shutil.copyfile(source, staged)
+    os.replace(staged, target)
+
+
+@pytest.fixture(scope="module")
+def app_db_path(_db_dir, request):
+    """Path of the database file the module's app reads."""
+    path = _db_dir / f"{request.module.__name__}_app.db"
+    yield path
+    path.unlink(missing_ok=True)
+
+
+@pytest.fixture(scope="module")
+def app(app_db_path):
+    """Create Flask app for testing, once per module.
+
+    Each test installs its own database at app_db_path (see app_database).
+    """
     test_config = {
-        "database_path": temp_db,
+        "database_path": str(app_db_path),
         "statements": {
             "staging_path": "/tmp/test_staging",
             "archive_path": "/tmp/test_archive",
@@ -24,19 +48,31 @@ def app(temp_db):
     }
     app = create_app(test_config)
     app.config["TESTING"] = True
+    # Compile every page template up front so no test pays for it
+    for name in app.jinja_env.list_templates(extensions=["html"]):
+        app.jinja_env.get_template(name)
     return app
 
 
 @pytest.fixture
-def client(app):
+def app_database(_seeded_template_db, app_db_path):
+    """Give this test a fresh, empty (schema and categories only) app database."""
+    install_database(_seeded_template_db, app_db_path)
+    return app_db_path
+
+
+@pytest.fixture
+def client(app, app_database):
     """Create test client."""
     return app.test_client()
 
 
-@pytest.fixture
-def db_with_transactions(temp_db):
-    """Database with realistic transaction data for dashboard testing."""
-    db = Database(temp_db)
+@pytest.fixture(scope="module")
+def _transactions_template_db(_seeded_template_db, _db_dir):
+    """Build the realistic transaction data once per module."""
+    db_path = _db_dir / "dashboard_transactions.db"
+    shutil.copyfile(_seeded_template_db, db_path)
+    db = Database(str(db_path))
 
     # Create account
     account = Account(
@@ -105,8 +141,19 @@ def db_with_transactions(temp_db):
         ),
     ]
     db.create_transactions_batch(transactions)
+    db.close()
 
-    yield temp_db
+    return db_path
+
+
+@pytest.fixture
+def db_with_transactions(_transactions_template_db, app_database):
+    """Database with realistic transaction data for dashboard testing.
+
+    Installed as this test's app database, so the client sees the data.
+    """
+    install_database(_transactions_template_db, app_database)
+    return app_database
 
 
 class TestDashboardRoutes:
@@ -170,13 +217,7 @@ class TestDataRendering:
 
     def test_index_renders_summary_with_data(self, client, db_with_transactions):
         """Should display monthly summary when data exists."""
-        # Create app with test database
-        test_config = {"database_path": db_with_transactions}
-        app = create_app(test_config)
-        app.config["TESTING"] = True
-        test_client = app.test_client()
-
-        response = test_client.get("/?year=2024&month=12")
+        response = client.get("/?year=2024&month=12")
         html = response.data.decode("utf-8")
 
         assert "Total Income" in html
@@ -185,12 +226,7 @@ class TestDataRendering:
 
     def test_index_displays_currency_formatting(self, client, db_with_transactions):
         """Amounts should be formatted with $ and commas."""
-        test_config = {"database_path": db_with_transactions}
-        app = create_app(test_config)
-        app.config["TESTING"] = True
-        test_client = app.test_client()
-
-        response = test_client.get("/?year=2024&month=12")
+        response = client.get("/?year=2024&month=12")
         html = response.data.decode("utf-8")
 
         # Check for currency symbol
@@ -198,12 +234,7 @@ class TestDataRendering:
 
     def test_categories_page_with_data(self, client, db_with_transactions):
         """Categories page should render with data."""
-        test_config = {"database_path": db_with_transactions}
-        app = create_app(test_config)
-        app.config["TESTING"] = True
-        test_client = app.test_client()
-
-        response = test_client.get("/categories?year=2024&month=12")
+        response = client.get("/categories?year=2024&month=12")
         html = response.data.decode("utf-8")
 
         # Should have some category names
@@ -211,12 +242,7 @@ class TestDataRendering:
 
     def test_transactions_page_with_data(self, client, db_with_transactions):
         """Transactions page should render transaction list."""
-        test_config = {"database_path": db_with_transactions}
-        app = create_app(test_config)
-        app.config["TESTING"] = True
-        test_client = app.test_client()
-
-        response = test_client.get("/transactions?year=2024&month=12")
+        response = client.get("/transactions?year=2024&month=12")
         html = response.data.decode("utf-8")
 
         # Should have transaction data
@@ -233,12 +259,7 @@ class TestMonthSelection:
 
     def test_changeMonth_function_present(self, client, db_with_transactions):
         """changeMonth() JavaScript function should be in HTML."""
-        test_config = {"database_path": db_with_transactions}
-        app = create_app(test_config)
-        app.config["TESTING"] = True
-        test_client = app.test_client()
-
-        response = test_client.get("/?year=2024&month=12")
+        response = client.get("/?year=2024&month=12")
         html = response.data.decode("utf-8")
 
         # Check for month change functionality
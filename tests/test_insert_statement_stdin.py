@@ -1,18 +1,56 @@
 """Tests for insert_statement.py script with stdin support.
 
 Critical tests for recent refactor to eliminate temp files.
+
+Most tests call the script's main() in-process; one smoke test runs the
+real command line to cover the entry point.
 """
 
+import importlib.util
+import io
 import json
+import logging
 import subprocess
 import pytest
 from pathlib import Path
 
+from src.database.models import Database
+
+SCRIPT_PATH = Path(__file__).parent.parent / "scripts" / "insert_statement.py"
+
+
+def _load_script():
+    """Import scripts/insert_statement.py (scripts/ is not a package)."""
+    spec = importlib.util.spec_from_file_location("insert_statement", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+insert_statement = _load_script()
+
+
+@pytest.fixture
+def run_script(temp_db, monkeypatch, capsys):
+    """Run insert_statement.main() in-process against temp_db.
+
+    Returns a function taking the CLI arguments and optional stdin text and
+    returning (exit code, parsed JSON output).
+    """
+    monkeypatch.setenv("DATABASE_PATH", temp_db)
+
+    def _run(args, stdin=""):
+        monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+        returncode = insert_statement.main(args)
+        return returncode, json.loads(capsys.readouterr().out)
+
+    return _run
+
 
 class TestInsertStatementStdin:
     """Test insert_statement.py --stdin interface."""
 
-    def test_accepts_stdin_flag(self, temp_db, sample_parsed_json, monkeypatch):
+    def test_accepts_stdin_flag(self, temp_db, sample_parsed_json_text, monkeypatch):
         """Script should accept --stdin flag and read JSON from stdin."""
         # Set up environment
         monkeypatch.setenv("DATABASE_PATH", temp_db)
@@ -31,7 +69,7 @@ class TestInsertStatementStdin:
         # Run with JSON piped to stdin
         result = subprocess.run(
             cmd,
-            input=json.dumps(sample_parsed_json),
+            input=sample_parsed_json_text,
             capture_output=True,
             text=True,
         )
@@ -44,129 +82,70 @@ class TestInsertStatementStdin:
         assert output["success"] is True
         assert output["transactions_inserted"] == 3
 
-    def test_stdin_invalid_json_returns_error(self, temp_db, monkeypatch):
+    def test_stdin_invalid_json_returns_error(self, run_script):
         """Invalid JSON on stdin should return error."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            "--stdin",
-            "--file-hash",
-            "test_hash",
-        ]
-
-        result = subprocess.run(
-            cmd,
-            input="{ invalid json }",
-            capture_output=True,
-            text=True,
+        returncode, output = run_script(
+            ["--stdin", "--file-hash", "test_hash"], stdin="{ invalid json }"
         )
 
-        assert result.returncode == 1
-        output = json.loads(result.stdout)
+        assert returncode == 1
         assert output["success"] is False
         assert "Failed to load JSON" in output["error"]
 
-    def test_requires_file_hash(self, temp_db, sample_parsed_json, monkeypatch):
+    def test_requires_file_hash(self, run_script, sample_parsed_json_text):
         """--file-hash should be required."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            "--stdin",
-            # Missing --file-hash
-        ]
-
-        result = subprocess.run(
-            cmd,
-            input=json.dumps(sample_parsed_json),
-            capture_output=True,
-            text=True,
-        )
-
         # Should fail with error about required argument
-        assert result.returncode != 0
+        with pytest.raises(SystemExit) as exc_info:
+            run_script(["--stdin"], stdin=sample_parsed_json_text)
 
-    def test_stdin_or_file_path_required(self, temp_db, monkeypatch):
-        """Either --stdin or file path must be provided."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
+        assert exc_info.value.code != 0
 
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            "--file-hash",
-            "test_hash",
-            # No --stdin, no file path
-        ]
-
-        result = subprocess.run(
-            cmd,
-            input="",  # Empty stdin
-            capture_output=True,
-            text=True,
-        )
+    def test_stdin_or_file_path_required(self, run_script):
+        """Either --stdin or file path must be provided."""
+        # No --stdin, no file path
+        returncode, output = run_script(["--file-hash", "test_hash"])
 
-        assert result.returncode == 1
-        output = json.loads(result.stdout)
+        assert returncode == 1
         assert output["success"] is False
         assert "Provide either json_file or --stdin" in output["error"]
 
+    def test_repeated_runs_add_no_log_handlers(
+        self, run_script, sample_parsed_json_text, tmp_path
+    ):
+        """Logging is configured once per process, not on every main() call."""
+        run_script(["--stdin", "--file-hash", "hash_1"], stdin=sample_parsed_json_text)
+        handlers = list(logging.getLogger().handlers)
+
+        run_script(["--stdin", "--file-hash", "hash_2"], stdin=sample_parsed_json_text)
+        insert_statement.setup_logging(tmp_path / "unused.log")
+
+        assert logging.getLogger().handlers == handlers
+        assert not (tmp_path / "unused.log").exists()
+
 
 class TestInsertStatementBackwardCompatibility:
     """Test insert_statement.py file path interface (backward compatibility)."""
 
-    def test_accepts_file_path(
-        self, temp_db, sample_parsed_json, temp_json_file, monkeypatch
-    ):
+    def test_accepts_file_path(self, run_script, sample_parsed_json, temp_json_file):
         """Script should still accept file path argument."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
         # Create temp JSON file
         json_file = temp_json_file(sample_parsed_json)
 
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            str(json_file),
-            "--file-hash",
-            "test_hash_file",
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        returncode, output = run_script(
+            [str(json_file), "--file-hash", "test_hash_file"]
+        )
 
-        assert result.returncode == 0
-        output = json.loads(result.stdout)
+        assert returncode == 0
         assert output["success"] is True
         assert output["transactions_inserted"] == 3
 
-    def test_file_not_found_returns_error(self, temp_db, monkeypatch):
+    def test_file_not_found_returns_error(self, run_script):
         """Non-existent file should return error."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            "/nonexistent/file.json",
-            "--file-hash",
-            "test_hash",
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        returncode, output = run_script(
+            ["/nonexistent/file.json", "--file-hash", "test_hash"]
+        )
 
-        assert result.returncode == 1
-        output = json.loads(result.stdout)
+        assert returncode == 1
         assert output["success"] is False
         assert "Failed to load JSON" in output["error"]
 
@@ -174,160 +153,125 @@ class TestInsertStatementBackwardCompatibility:
 class TestInsertStatementDuplicateDetection:
     """Test duplicate statement and transaction detection."""
 
-    def test_duplicate_statement_skipped(
-        self, temp_db, sample_parsed_json, monkeypatch
-    ):
+    def test_duplicate_statement_skipped(self, run_script, sample_parsed_json_text):
         """Statement with duplicate file_hash should be skipped."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            "--stdin",
-            "--file-hash",
-            "duplicate_hash",
-        ]
+        args = ["--stdin", "--file-hash", "duplicate_hash"]
 
         # First insertion
-        result1 = subprocess.run(
-            cmd,
-            input=json.dumps(sample_parsed_json),
-            capture_output=True,
-            text=True,
-        )
-        output1 = json.loads(result1.stdout)
+        _, output1 = run_script(args, stdin=sample_parsed_json_text)
         assert output1["success"] is True
         assert output1["duplicate_statement"] is False
         assert output1["transactions_inserted"] == 3
 
         # Second insertion with same hash
-        result2 = subprocess.run(
-            cmd,
-            input=json.dumps(sample_parsed_json),
-            capture_output=True,
-            text=True,
-        )
-        output2 = json.loads(result2.stdout)
+        _, output2 = run_script(args, stdin=sample_parsed_json_text)
         assert output2["success"] is True
         assert output2["duplicate_statement"] is True
 
     def test_duplicate_transactions_counted(
-        self, temp_db, sample_parsed_json, monkeypatch
+        self, run_script, sample_parsed_json, sample_parsed_json_text
     ):
         """Duplicate transactions should be counted separately."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
         # Modify sample to have unique hashes and file paths
-        import copy
-
-        parsed1 = copy.deepcopy(sample_parsed_json)
-        parsed2 = copy.deepcopy(sample_parsed_json)
-        parsed2["file_path"] = "data/statements/staging/test2.csv"
+        parsed2 = {
+            **sample_parsed_json,
+            "file_path": "data/statements/staging/test2.csv",
+        }
 
         # First insertion
-        result1 = subprocess.run(
-            [
-                "uv",
-                "run",
-                "python",
-                "scripts/insert_statement.py",
-                "--stdin",
-                "--file-hash",
-                "hash_1",
-            ],
-            input=json.dumps(parsed1),
-            capture_output=True,
-            text=True,
+        _, output1 = run_script(
+            ["--stdin", "--file-hash", "hash_1"], stdin=sample_parsed_json_text
         )
-        output1 = json.loads(result1.stdout)
         assert output1["transactions_inserted"] == 3
         assert output1["transactions_duplicate"] == 0
 
         # Second insertion (different hash, same transactions)
-        result2 = subprocess.run(
-            [
-                "uv",
-                "run",
-                "python",
-                "scripts/insert_statement.py",
-                "--stdin",
-                "--file-hash",
-                "hash_2",
-            ],
-            input=json.dumps(parsed2),
-            capture_output=True,
-            text=True,
+        _, output2 = run_script(
+            ["--stdin", "--file-hash", "hash_2"], stdin=json.dumps(parsed2)
         )
-        output2 = json.loads(result2.stdout)
         # All transactions are duplicates
         assert output2["transactions_inserted"] == 0
         assert output2["transactions_duplicate"] == 3
 
+    def test_unrounded_stored_amounts_counted_as_duplicates(
+        self, run_script, sample_parsed_json, temp_db
+    ):
+        """Re-ingesting rows stored before amounts were rounded adds nothing."""
+        unrounded = {
+            **sample_parsed_json,
+            "transactions": [
+                {**txn, "amount": txn["amount"] + 0.0004}
+                for txn in sample_parsed_json["transactions"]
+            ],
+        }
+        run_script(["--stdin", "--file-hash", "hash_1"], stdin=json.dumps(unrounded))
+        # Store the amounts as they were before rounding was introduced
+        db = Database(temp_db)
+        for txn in unrounded["transactions"]:
+            db.execute(
+                "UPDATE transactions SET amount = ? WHERE merchant_original = ?",
+                (txn["amount"], txn["merchant_original"]),
+            )
+        db.close()
+
+        parsed2 = {**sample_parsed_json, "file_path": "data/statements/staging/2.csv"}
+        _, output = run_script(
+            ["--stdin", "--file-hash", "hash_2"], stdin=json.dumps(parsed2)
+        )
+
+        assert output["transactions_inserted"] == 0
+        assert output["transactions_duplicate"] == 3
+
 
 class TestInsertStatementAccountCreation:
     """Test account creation behavior."""
 
-    def test_creates_new_account(self, temp_db, sample_parsed_json, monkeypatch):
+    def test_creates_new_account(self, run_script, sample_parsed_json_text):
         """Should create account if it doesn't exist."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            "--stdin",
-            "--file-hash",
-            "test_hash",
-        ]
-
-        result = subprocess.run(
-            cmd,
-            input=json.dumps(sample_parsed_json),
-            capture_output=True,
-            text=True,
+        _, output = run_script(
+            ["--stdin", "--file-hash", "test_hash"],
+            stdin=sample_parsed_json_text,
         )
 
-        output = json.loads(result.stdout)
         assert output["success"] is True
         assert output["account_created"] is True
 
-    def test_reuses_existing_account(self, temp_db, sample_parsed_json, monkeypatch):
+    def test_reuses_existing_account(
+        self, run_script, sample_parsed_json, sample_parsed_json_text
+    ):
         """Should reuse account if it exists."""
-        monkeypatch.setenv("DATABASE_PATH", temp_db)
-
-        cmd = [
-            "uv",
-            "run",
-            "python",
-            "scripts/insert_statement.py",
-            "--stdin",
-            "--file-hash",
-        ]
+        args = ["--stdin", "--file-hash"]
 
         # First insertion creates account
-        result1 = subprocess.run(
-            [*cmd, "hash_1"],
-            input=json.dumps(sample_parsed_json),
-            capture_output=True,
-            text=True,
-        )
-        output1 = json.loads(result1.stdout)
+        _, output1 = run_script([*args, "hash_1"], stdin=sample_parsed_json_text)
         assert output1["account_created"] is True
 
         # Second insertion reuses account
-        import copy
-
-        parsed2 = copy.deepcopy(sample_parsed_json)
-        parsed2["file_path"] = "data/statements/staging/test2.csv"
-        result2 = subprocess.run(
-            [*cmd, "hash_2"],
-            input=json.dumps(parsed2),
-            capture_output=True,
-            text=True,
-        )
-        output2 = json.loads(result2.stdout)
+        parsed2 = {
+            **sample_parsed_json,
+            "file_path": "data/statements/staging/test2.csv",
+        }
+        _, output2 = run_script([*args, "hash_2"], stdin=json.dumps(parsed2))
         assert output2["account_created"] is False
         assert output2["account_id"] == output1["account_id"]
+
+
+class TestInsertStatementInvalidRows:
+    """Test rows that cannot be stored."""
+
+    def test_dateless_transaction_skipped(self, run_script, sample_parsed_json):
+        """A row without transaction_date is dropped; the others are inserted."""
+        dateless = {**sample_parsed_json["transactions"][0], "transaction_date": ""}
+        parsed = {
+            **sample_parsed_json,
+            "transactions": [*sample_parsed_json["transactions"], dateless],
+        }
+
+        returncode, output = run_script(
+            ["--stdin", "--file-hash", "hash_dateless"], stdin=json.dumps(parsed)
+        )
+
+        assert returncode == 0
+        assert output["success"] is True
+        assert output["transactions_inserted"] == 3
+        assert output["transactions_duplicate"] == 0
@@ -1,32 +1,16 @@
 """Tests for dashboard query functionality."""
 
+import os
 import pytest
 import sqlite3
-import tempfile
-from pathlib import Path
+import threading
 from datetime import date
+from pathlib import Path
 
 from src.database.models import Database, Transaction, Account
 from src.dashboard.queries import DashboardQueries
 
 
-@pytest.fixture
-def temp_db():
-    """Create a temporary database for testing."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
-
-    # Initialize schema
-    db = Database(db_path)
-    db.init_schema()
-    db.seed_categories()
-
-    yield db_path
-
-    # Cleanup
-    Path(db_path).unlink(missing_ok=True)
-
-
 @pytest.fixture
 def db_with_data(temp_db):
     """Create a database with sample data."""
@@ -76,10 +60,59 @@ def db_with_data(temp_db):
         ),
     ]
     db.create_transactions_batch(transactions)
+    db.close()
 
     return temp_db
 
 
+def summary_and_scan(db):
+    """Return (monthly_summary rows, the same totals scanned from transactions)."""
+    with db.get_connection(row_factory=None) as conn:
+        summary_rows = conn.execute(
+            "SELECT month, total_income, total_expenses, transaction_count "
+            "FROM monthly_summary ORDER BY month"
+        ).fetchall()
+        scanned_rows = conn.execute("""
+            SELECT
+                substr(transaction_date, 1, 7),
+                SUM(CASE WHEN amount > 0 AND transaction_type
+                    NOT IN ('payment', 'transfer') THEN amount ELSE 0 END),
+                SUM(CASE WHEN amount < 0 AND transaction_type
+                    NOT IN ('payment', 'transfer') THEN -amount ELSE 0 END),
+                COUNT(*)
+            FROM transactions
+            GROUP BY 1
+            ORDER BY 1
+            """).fetchall()
+    return summary_rows, scanned_rows
+
+
+def drop_monthly_summary(db):
+    """Remove monthly_summary and its triggers, as on a pre-006 database."""
+    db.execute_many(
+        [
+            ("DROP TRIGGER trg_monthly_summary_insert", ()),
+            ("DROP TRIGGER trg_monthly_summary_delete", ()),
+            ("DROP TRIGGER trg_monthly_summary_update", ()),
+            ("DROP TABLE monthly_summary", ()),
+        ]
+    )
+
+
+def add_transaction(db, day, amount, merchant):
+    """Insert one December 2024 transaction on the test account."""
+    db.create_transaction(
+        Transaction(
+            id=None,
+            account_id=1,
+            transaction_date=date(2024, 12, day),
+            amount=amount,
+            merchant_original=merchant,
+            transaction_type="expense" if amount < 0 else "income",
+        )
+    )
+
+
 class TestDashboardQueries:
     """Tests for dashboard queries."""
 
@@ -94,6 +127,80 @@ class TestDashboardQueries:
         assert summary.net == 925.00
         assert summary.transaction_count == 3
 
+    def test_monthly_summary_table_matches_transactions(self, db_with_data):
+        """Test that the monthly_summary triggers track inserts, updates, deletes."""
+        db = Database(db_with_data)
+        db.execute(
+            "UPDATE transactions SET transaction_date = '2024-11-30' "
+            "WHERE merchant_original = 'RESTAURANT'"
+        )
+        db.execute("DELETE FROM transactions WHERE merchant_original = 'PAYCHECK'")
+        db.execute(
+            "UPDATE transactions SET transaction_type = 'transfer' "
+            "WHERE merchant_original = 'GROCERY STORE'"
+        )
+
+        summary_rows, scanned_rows = summary_and_scan(db)
+        db.close()
+
+        assert summary_rows == scanned_rows
+        assert summary_rows == [("2024-11", 0, 25.0, 1), ("2024-12", 0, 0, 1)]
+
+        queries = DashboardQueries(db_with_data)
+        assert queries.get_available_months() == [(2024, 12), (2024, 11)]
+        summary = queries.get_monthly_summary(2024, 12)
+        assert summary.total_income == 0
+        assert summary.total_expenses == 0
+        assert summary.transaction_count == 1
+
+    def test_summary_without_monthly_summary_table(self, db_with_data):
+        """Test that unmigrated databases fall back to scanning transactions."""
+        db = Database(db_with_data)
+        drop_monthly_summary(db)
+        db.close()
+
+        queries = DashboardQueries(db_with_data)
+        summary = queries.get_monthly_summary(2024, 12)
+        assert summary.total_income == 1000.00
+        assert summary.total_expenses == 75.00
+        assert summary.transaction_count == 3
+        assert queries.get_available_months() == [(2024, 12)]
+        queries.close()
+
+    def test_init_schema_backfills_new_summary_table(self, db_with_data):
+        """Test that init_schema fills a monthly_summary it creates."""
+        db = Database(db_with_data)
+        drop_monthly_summary(db)
+
+        db.init_schema()
+        add_transaction(db, 20, -10.00, "BAKERY")
+
+        summary_rows, scanned_rows = summary_and_scan(db)
+        db.close()
+        assert summary_rows == scanned_rows
+        assert summary_rows == [("2024-12", 1000.0, 85.0, 4)]
+
+    def test_migration_recomputes_partial_summary(self, db_with_data):
+        """Test that migration 006 replaces totals the triggers only partly hold.
+
+        Simulates init_schema having created the table before the backfill
+        existed: the table starts empty and only sees later inserts.
+        """
+        db = Database(db_with_data)
+        db.execute("DELETE FROM monthly_summary")
+        add_transaction(db, 20, -10.00, "BAKERY")
+
+        migration = (
+            Path(__file__).parent.parent / "migrations" / "006_add_monthly_summary.sql"
+        )
+        with db.get_connection() as conn:
+            conn.executescript(migration.read_text())
+
+        summary_rows, scanned_rows = summary_and_scan(db)
+        db.close()
+        assert summary_rows == scanned_rows
+        assert summary_rows == [("2024-12", 1000.0, 85.0, 4)]
+
     def test_category_breakdown(self, db_with_data):
         """Test category breakdown."""
         queries = DashboardQueries(db_with_data)
@@ -150,3 +257,114 @@ class TestDashboardQueries:
                 conn.execute(
                     "INSERT INTO accounts (account_name, bank_name) VALUES ('test', 'test')"
                 )
+
+    def test_connection_reused_and_sees_new_writes(self, db_with_data):
+        """Test that one connection serves later calls and reads fresh data."""
+        queries = DashboardQueries(db_with_data)
+
+        with queries.get_connection() as conn:
+            first = conn
+        assert queries.get_monthly_summary(2024, 12).transaction_count == 3
+
+        db = Database(db_with_data)
+        db.execute(
+            "UPDATE transactions SET transaction_date = '2024-11-30' "
+            "WHERE merchant_original = 'PAYCHECK'"
+        )
+        db.close()
+
+        assert queries.get_monthly_summary(2024, 12).transaction_count == 2
+        with queries.get_connection() as conn:
+            assert conn is first
+        queries.close()
+
+    def test_connection_shared_across_threads(self, db_with_data):
+        """Test that request threads reuse one connection instead of opening more."""
+        queries = DashboardQueries(db_with_data)
+        seen = []
+
+        def handle_request():
+            with queries.get_connection() as conn:
+                seen.append(conn)
+            queries.get_monthly_summary(2024, 12)
+
+        threads = [threading.Thread(target=handle_request) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(seen) == 3
+        assert all(conn is seen[0] for conn in seen)
+        queries.close()
+
+    def test_connection_reopened_when_file_replaced(self, db_with_data):
+        """Test that a replaced database file gets a fresh connection."""
+        queries = DashboardQueries(db_with_data)
+        with queries.get_connection() as conn:
+            first = conn
+
+        replacement = db_with_data + ".new"
+        with sqlite3.connect(db_with_data) as src, sqlite3.connect(replacement) as dst:
+            src.backup(dst)
+        src.close()
+        dst.close()
+        os.replace(replacement, db_with_data)
+
+        with queries.get_connection() as conn:
+            assert conn is not first
+        assert queries.get_monthly_summary(2024, 12).transaction_count == 3
+        queries.close()
+
+    def test_category_breakdown_cached_until_write(self, db_with_data, monkeypatch):
+        """Test that breakdowns are reused until another connection commits."""
+        queries = DashboardQueries(db_with_data)
+        runs = []
+        run_query = queries._category_breakdown
+
+        def counting_query(year, month):
+            runs.append((year, month))
+            return run_query(year, month)
+
+        monkeypatch.setattr(queries, "_category_breakdown", counting_query)
+
+        first = queries.get_category_breakdown(2024, 12)
+        # Results are copies: changing one must not leak into the cache
+        first[0].amount = 0
+        second = queries.get_category_breakdown(2024, 12)
+        assert runs == [(2024, 12)]
+        assert second[0].amount == 50.00
+
+        db = Database(db_with_data)
+        db.execute(
+            "UPDATE transactions SET category = 'Groceries' "
+            "WHERE merchant_original = 'RESTAURANT'"
+        )
+        db.close()
+
+        breakdown = queries.get_category_breakdown(2024, 12)
+        assert runs == [(2024, 12), (2024, 12)]
+        assert [(c.category, c.amount) for c in breakdown] == [("Groceries", 75.00)]
+        queries.close()
+
+    def test_cache_shared_across_threads(self, db_with_data, monkeypatch):
+        """Test that a result cached by one request thread serves the next."""
+        queries = DashboardQueries(db_with_data)
+        runs = []
+        run_query = queries._month_totals
+
+        def counting_query(year, month):
+            runs.append((year, month))
+            return run_query(year, month)
+
+        monkeypatch.setattr(queries, "_month_totals", counting_query)
+
+        for _ in range(3):
+            thread = threading.Thread(
+                target=queries.get_monthly_summary, args=(2024, 12)
+            )
+            thread.start()
+            thread.join()
+
+        assert runs == [(2024, 12)]
+        queries.close()